@@ -5,6 +5,9 @@ import warnings
 import numpy as np
 import tempfile
 import logging
+from collections import deque
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
 
 # Zarr imports
 import zarr
@@ -12,15 +15,22 @@ from zarr.hierarchy import Group
 from zarr.core import Array
 from zarr.storage import (DirectoryStore,
                           TempStore,
-                          NestedDirectoryStore)
+                          NestedDirectoryStore,
+                          FSStore,
+                          ConsolidatedMetadataStore,
+                          normalize_store_arg)
 import numcodecs
+from numcodecs import Blosc
 
 # HDMF-ZARR imports
 from .utils import (ZarrDataIO,
                     ZarrReference,
                     ZarrSpecWriter,
                     ZarrSpecReader,
-                    ZarrIODataChunkIteratorQueue)
+                    ZarrIODataChunkIteratorQueue,
+                    ObjectIdCache,
+                    DirectIODirectoryStore,
+                    MmapDirectoryStore)
 from .zarr_utils import BuilderZarrReferenceDataset, BuilderZarrTableDataset
 
 # HDMF imports
@@ -41,7 +51,7 @@ from hdmf.build import (Builder,
                         RegionBuilder,
                         ReferenceBuilder,
                         TypeMap)
-from hdmf.data_utils import AbstractDataChunkIterator
+from hdmf.data_utils import AbstractDataChunkIterator, DataChunkIterator
 from hdmf.spec import (RefSpec,
                        DtypeSpec,
                        NamespaceCatalog)
@@ -71,6 +81,38 @@ SUPPORTED_ZARR_STORES = (DirectoryStore,
 Tuple listing all Zarr storage backends supported by ZarrIO
 """
 
+DEFAULT_COMPRESSOR = Blosc(cname='zstd', clevel=3, shuffle=Blosc.BITSHUFFLE)
+"""
+Compressor used for datasets for which no compressor is specified via ZarrDataIO
+"""
+
+NUMERIC_DTYPE_KINDS = frozenset('iufcm')
+"""
+Kinds of numpy dtypes that are subtypes of np.number, i.e., signed and unsigned integers, floats, complex, and timedelta
+"""
+
+FLEXIBLE_OR_OBJECT_DTYPE_KINDS = frozenset('SUVO')
+"""
+Kinds of numpy dtypes that are subtypes of np.flexible (i.e., bytes, str, and void) or np.object_
+"""
+
+JSON_CONVERT_TYPES = (np.ndarray, np.generic, bytes)
+"""
+Tuple of attribute value types that must be converted before they can be written as JSON
+"""
+
+REMOTE_READ_JOBS = 8
+"""
+Number of threads used by read_builder to fetch the metadata and scalar values of sibling datasets of remote files
+in parallel
+"""
+
+HDMFDATASET_STREAM_SIZE = 128 * 1024 ** 2
+"""
+Size in bytes above which numeric HDMFDatasets and h5py.Datasets (e.g., when exporting from HDF5) are copied in
+blocks of about this size rather than being loaded into memory all at once
+"""
+
 
 class ZarrIO(HDMFIO):
 
@@ -78,8 +120,14 @@ class ZarrIO(HDMFIO):
     def can_read(path):
         try:
             # TODO: how to use storage_options? Maybe easier to just check for ".zarr" suffix
-            zarr.open(path, mode="r")
-            return True
+            # Probe the store for the metadata keys of a Zarr group or array rather than opening the file
+            store = normalize_store_arg(path, mode="r")
+            try:
+                return any(key in store for key in ('.zgroup', '.zarray', '.zmetadata'))
+            finally:
+                # Close the store if we created it, e.g., the ZipStore for a path to a .zip file
+                if store is not path:
+                    store.close()
         except Exception:
             return False
 
@@ -94,16 +142,28 @@ class ZarrIO(HDMFIO):
              'doc': 'Zarr synchronizer to use for parallel I/O. If set to True a ProcessSynchronizer is used.',
              'default': None},
             {'name': 'object_codec_class', 'type': None,
-             'doc': 'Set the numcodec object codec class to be used to encode objects.'
-                    'Use numcodecs.pickles.Pickle by default.',
+             'doc': 'Set the numcodec object codec class to be used to encode objects. '
+                    'Use numcodecs.MsgPack by default. Compound datasets with object fields are encoded '
+                    'with numcodecs.pickles.Pickle by default since MsgPack cannot round-trip their records.',
              'default': None},
             {'name': 'storage_options', 'type': dict,
              'doc': 'Zarr storage options to read remote folders',
-             'default': None})
+             'default': None},
+            {'name': 'direct_io', 'type': bool,
+             'doc': 'Write the chunks of local Zarr files with direct I/O (O_DIRECT), bypassing the page cache. '
+                    'Only applies when path is a local path and the file is opened for writing. '
+                    'See hdmf_zarr.utils.DirectIODirectoryStore for details.',
+             'default': False},
+            {'name': 'use_mmap', 'type': bool,
+             'doc': 'Read the chunks of local Zarr files by memory-mapping them rather than copying them. '
+                    'Only applies when path is a local path and the file is opened in read mode. '
+                    'See hdmf_zarr.utils.MmapDirectoryStore for details.',
+             'default': False})
     def __init__(self, **kwargs):
         self.logger = logging.getLogger('%s.%s' % (self.__class__.__module__, self.__class__.__qualname__))
-        path, manager, mode, synchronizer, object_codec_class, storage_options = popargs(
-            'path', 'manager', 'mode', 'synchronizer', 'object_codec_class', 'storage_options', kwargs)
+        path, manager, mode, synchronizer, object_codec_class, storage_options, direct_io, use_mmap = popargs(
+            'path', 'manager', 'mode', 'synchronizer', 'object_codec_class', 'storage_options', 'direct_io',
+            'use_mmap', kwargs)
         if manager is None:
             manager = BuildManager(TypeMap(NamespaceCatalog()))
         if isinstance(synchronizer, bool):
@@ -118,11 +178,32 @@ class ZarrIO(HDMFIO):
         self.__path = path
         self.__file = None
         self.__storage_options = storage_options
+        self.__direct_io = direct_io
+        self.__use_mmap = use_mmap
         self.__built = dict()
+        # Caches used while writing. These are cleared by __clear_caches before and after each call to write_builder
+        self.__path_cache = ObjectIdCache()  # cache of paths of builders
+        self.__ref_source_cache = dict()  # cache of relative reference sources by builder source
+        self.__open_file_cache = dict()  # cache of files opened by resolve_ref
+        self.__resolved_ref_cache = dict()  # cache of the targets of references by (source, path)
+        self.__root_cache = ObjectIdCache()  # cache of root builders of builders
+        self.__pending_links = ObjectIdCache()  # links buffered per group by __write_groups
+        self.__ref_cache = ObjectIdCache()  # cache of the ZarrReferences created by __get_ref
+        # Caches used while reading. These remain valid between writes and are cleared by __clear_caches on close
+        self.__store_path_cache = ObjectIdCache()  # cache of the paths of the stores of read Zarr objects
+        self.__zarr_file_path_cache = ObjectIdCache()  # cache of the paths of the Zarr files of stores
         self._written_builders = WriteStatusTracker()  # track which builders were written (or read) by this IO object
+        self.__metadata_modified = False  # whether attributes or the spec were written since the last consolidation
         self.__dci_queue = None  # Will be initialized on call to io.write
+        self.__io_pool = None  # Thread pool for writing or reading datasets in parallel during write/read_builder
         # Codec class to be used. Alternates, e.g., =numcodecs.JSON
-        self.__codec_cls = numcodecs.pickles.Pickle if object_codec_class is None else object_codec_class
+        self.__codec_cls = numcodecs.MsgPack if object_codec_class is None else object_codec_class
+        # Codec class to be used for compound datasets with object fields. MsgPack decodes records as lists,
+        # so unless the user specified a codec we keep using Pickle to preserve the compound structure
+        self.__compound_codec_cls = numcodecs.pickles.Pickle if object_codec_class is None else object_codec_class
+        # The codecs are stateless, so we create them once and share them between all datasets
+        self.__codec = self.__codec_cls()
+        self.__compound_codec = self.__compound_codec_cls()
         source_path = self.__path
         if isinstance(self.__path, SUPPORTED_ZARR_STORES):
             source_path = self.__path.path
@@ -167,25 +248,83 @@ class ZarrIO(HDMFIO):
                 # r- is only an internal mode in ZarrIO to force the use of regular open. For Zarr we need to
                 # use the regular mode r when r- is specified
                 mode_to_use = self.__mode if self.__mode != 'r-' else 'r'
-                self.__file = zarr.open(store=self.path,
+                self.__file = zarr.open(store=self.__get_write_store(),
                                         mode=mode_to_use,
                                         synchronizer=self.__synchronizer,
                                         storage_options=self.__storage_options)
             else:
-                self.__file = self.__open_file_consolidated(store=self.path,
+                self.__file = self.__open_file_consolidated(store=self.__get_read_store(),
                                                             mode=self.__mode,
                                                             synchronizer=self.__synchronizer,
                                                             storage_options=self.__storage_options)
 
+    def __get_write_store(self):
+        """
+        Get the store to use when opening the file for writing.
+
+        When creating a new file at a local path, a DirectoryStore with a nested ('/') dimension separator
+        is used, so that the chunks of large arrays are stored in nested directories rather than as
+        millions of files in a single directory. Existing files and user-defined stores are opened as is,
+        since the dimension separator of the store must match the one used by existing arrays.
+        If direct_io was requested, local paths are opened with a DirectIODirectoryStore instead.
+        """
+        path = self.path
+        if (not isinstance(path, str) or "://" in path or "::" in path or
+                path.endswith(".zip") or path.endswith(".n5")):
+            return path
+        store_cls = DirectIODirectoryStore if self.__direct_io else DirectoryStore
+        if self.__mode in ('w', 'w-') or (self.__mode == 'a' and not os.path.exists(path)):
+            return store_cls(path, dimension_separator='/')
+        if self.__direct_io:
+            return store_cls(path)
+        return path
+
+    def __get_read_store(self):
+        """
+        Get the store to use when opening the file for reading. If use_mmap was requested, local paths are
+        opened with a MmapDirectoryStore. Otherwise, the path is opened as is.
+        """
+        path = self.path
+        if (self.__use_mmap and isinstance(path, str) and os.path.isdir(path) and
+                "://" not in path and "::" not in path):
+            return MmapDirectoryStore(path)
+        return path
+
     def close(self):
         """Close the Zarr file"""
         self.__file = None
+        self.__clear_caches()
         return
 
+    def __clear_caches(self, write_only=False):
+        """
+        Clear the caches of the IO object
+        :param write_only: Only clear the caches used while writing, but keep the caches used while reading
+        :type write_only: bool
+        """
+        self.__path_cache.clear()
+        self.__ref_source_cache.clear()
+        self.__open_file_cache.clear()
+        self.__resolved_ref_cache.clear()
+        self.__root_cache.clear()
+        self.__pending_links.clear()
+        self.__ref_cache.clear()
+        if not write_only:
+            self.__store_path_cache.clear()
+            self.__zarr_file_path_cache.clear()
+
+    def flush(self):
+        """Write all DataChunkIterators that have been queued by writing datasets with exhaust_dci=False"""
+        if self.__dci_queue is not None:
+            self.__dci_queue.exhaust_queue()
+
     def is_remote(self):
         """Return True if the file is remote, False otherwise"""
-        from zarr.storage import FSStore, ConsolidatedMetadataStore
-        if isinstance(self.file.store, (FSStore, ConsolidatedMetadataStore)):
+        store = self.file.store
+        # Files opened with consolidated metadata wrap the actual store in a ConsolidatedMetadataStore
+        if isinstance(store, ConsolidatedMetadataStore):
+            store = store.store
+        if isinstance(store, FSStore):
             return True
         else:
             return False
@@ -203,16 +342,25 @@ class ZarrIO(HDMFIO):
         Load cached namespaces from a file.
         '''
         # TODO: how to use storage_options here?
-        f = zarr.open(path, mode='r')
-        if SPEC_LOC_ATTR not in f.attrs:
+        # Use the consolidated metadata if available so that listing the cached namespaces and versions
+        # does not require listing the store
+        f = cls.__open_file_consolidated(store=path, mode='r')
+        spec_loc = f.attrs.get(SPEC_LOC_ATTR)
+        # Files written by earlier versions of hdmf-zarr consolidated the metadata before the spec was cached,
+        # so the consolidated metadata may not include the cached spec. Read those from the actual store.
+        if (spec_loc is None or spec_loc not in f) and isinstance(f.store, ConsolidatedMetadataStore):
+            f = zarr.open(store=f.store.store, mode='r')
+            spec_loc = f.attrs.get(SPEC_LOC_ATTR)
+        if spec_loc is None:
             msg = "No cached namespaces found in %s" % path
             warnings.warn(msg)
         else:
-            spec_group = f[f.attrs[SPEC_LOC_ATTR]]
+            spec_group = f[spec_loc]
             if namespaces is None:
                 namespaces = list(spec_group.keys())
             for ns in namespaces:
                 ns_group = spec_group[ns]
+                # zarr lists the keys in sorted order, so the last version is the latest one
                 latest_version = list(ns_group.keys())[-1]
                 ns_group = ns_group[latest_version]
                 reader = ZarrSpecReader(ns_group)
@@ -226,13 +374,14 @@ class ZarrIO(HDMFIO):
         {'name': 'exhaust_dci', 'type': bool,
          'doc': 'exhaust DataChunkIterators one at a time. If False, add ' +
                 'them to the internal queue self.__dci_queue and exhaust them concurrently at the end',
-         'default': True},
+         'default': False},
         {
             "name": "number_of_jobs",
             "type": int,
             "doc": (
                 "Number of jobs to use in parallel during write "
-                "(only works with GenericDataChunkIterator-wrapped datasets)."
+                "(only works with GenericDataChunkIterator-wrapped datasets). If greater than 1, "
+                "this is also the number of threads used to write the datasets of different groups in parallel."
             ),
             "default": 1,
         },
@@ -274,9 +423,25 @@ class ZarrIO(HDMFIO):
             multiprocessing_context=multiprocessing_context,
         )
 
-        super(ZarrIO, self).write(**kwargs)
+        # Cache the spec before writing the builders so that it is included in the consolidated metadata
         if cache_spec:
             self.__cache_spec()
+        self.__start_io_pool(number_of_jobs)
+        try:
+            super(ZarrIO, self).write(**kwargs)
+        finally:
+            self.__stop_io_pool()
+
+    def __start_io_pool(self, number_of_jobs):
+        """Create the thread pool used to write or read datasets in parallel if more than one job is requested"""
+        if number_of_jobs > 1:
+            self.__io_pool = ThreadPoolExecutor(max_workers=number_of_jobs)
+
+    def __stop_io_pool(self):
+        """Wait for all tasks of the thread pool to finish and shut the pool down"""
+        if self.__io_pool is not None:
+            self.__io_pool.shutdown(wait=True)
+            self.__io_pool = None
 
     def __cache_spec(self):
         """Internal function used to cache the spec in the current file"""
@@ -299,6 +464,7 @@ class ZarrIO(HDMFIO):
             ns_group = spec_group.require_group(group_name)
             writer = ZarrSpecWriter(ns_group)
             ns_builder.export('namespace', writer=writer)
+        self.__metadata_modified = True
 
     @docval(
         *get_docval(HDMFIO.export),
@@ -308,7 +474,8 @@ class ZarrIO(HDMFIO):
             "type": int,
             "doc": (
                 "Number of jobs to use in parallel during write "
-                "(only works with GenericDataChunkIterator-wrapped datasets)."
+                "(only works with GenericDataChunkIterator-wrapped datasets). If greater than 1, "
+                "this is also the number of threads used to write the datasets of different groups in parallel."
             ),
             "default": 1,
         },
@@ -358,9 +525,14 @@ class ZarrIO(HDMFIO):
         write_args['export_source'] = src_io.source  # pass export_source=src_io.source to write_builder
         ckwargs = kwargs.copy()
         ckwargs['write_args'] = write_args
-        super().export(**ckwargs)
+        # Cache the spec before writing the builders so that it is included in the consolidated metadata
         if cache_spec:
             self.__cache_spec()
+        self.__start_io_pool(number_of_jobs)
+        try:
+            super().export(**ckwargs)
+        finally:
+            self.__stop_io_pool()
 
     def get_written(self, builder, check_on_disk=False):
         """
@@ -377,7 +549,7 @@ class ZarrIO(HDMFIO):
         """
         written = self._written_builders.get_written(builder)
         if written and check_on_disk:
-            written = written and self.get_builder_exists_on_disk(builder=builder)
+            written = os.path.exists(self.__get_builder_disk_path(builder))
         return written
 
     @docval({'name': 'builder', 'type': Builder, 'doc': 'The builder of interest'})
@@ -386,7 +558,7 @@ class ZarrIO(HDMFIO):
         Convenience function to check whether a given builder exists on disk in this Zarr file.
         """
         builder = getargs('builder', kwargs)
-        builder_path = self.get_builder_disk_path(builder=builder, filepath=None)
+        builder_path = self.__get_builder_disk_path(builder)
         exists_on_disk = os.path.exists(builder_path)
         return exists_on_disk
 
@@ -395,6 +567,10 @@ class ZarrIO(HDMFIO):
              'doc': 'The path to the Zarr file or None for this file', 'default': None})
     def get_builder_disk_path(self, **kwargs):
         builder, filepath = getargs('builder', 'filepath', kwargs)
+        return self.__get_builder_disk_path(builder, filepath)
+
+    def __get_builder_disk_path(self, builder, filepath=None):
+        """Internal helper for get_builder_disk_path used to avoid the docval overhead on internal calls"""
         basepath = filepath if filepath is not None else self.source
         builder_path = os.path.join(basepath, self.__get_path(builder).lstrip("/"))
         return builder_path
@@ -414,7 +590,7 @@ class ZarrIO(HDMFIO):
                 'Exhaust DataChunkIterators one at a time. If False, add '
                 'them to the internal queue self.__dci_queue and exhaust them concurrently at the end'
             ),
-            'default': True,
+            'default': False,
         },
         {
             'name': 'export_source',
@@ -426,7 +602,9 @@ class ZarrIO(HDMFIO):
             "name": "consolidate_metadata",
             "type": bool,
             "doc": (
-                "Consolidate metadata into a single .zmetadata file in the root group to accelerate read."
+                "Consolidate metadata into a single .zmetadata file in the root group to accelerate read. "
+                "Consolidation is skipped if no new builders, attributes, or specs were written and the file "
+                "already has consolidated metadata."
             ),
             "default": True,
         }
@@ -436,14 +614,15 @@ class ZarrIO(HDMFIO):
         f_builder, link_data, exhaust_dci, export_source, consolidate_metadata = getargs(
             'builder', 'link_data', 'exhaust_dci', 'export_source', 'consolidate_metadata', kwargs
         )
-        for name, gbldr in f_builder.groups.items():
-            self.write_group(
-                parent=self.__file,
-                builder=gbldr,
-                link_data=link_data,
-                exhaust_dci=exhaust_dci,
-                export_source=export_source,
-            )
+        self.__clear_caches(write_only=True)
+        num_written_builders = len(self._written_builders)
+        self.__write_groups(
+            parent=self.__file,
+            builders=list(f_builder.groups.values()),
+            link_data=link_data,
+            exhaust_dci=exhaust_dci,
+            export_source=export_source,
+        )
         for name, dbldr in f_builder.datasets.items():
             self.write_dataset(
                 parent=self.__file,
@@ -453,14 +632,20 @@ class ZarrIO(HDMFIO):
                 export_source=export_source,
             )
         self.write_attributes(self.__file, f_builder.attributes)  # the same as set_attributes in HDMF
-        self.__dci_queue.exhaust_queue()  # Write any remaining DataChunkIterators that have been queued
+        self.flush()  # Write any remaining DataChunkIterators that have been queued
         self._written_builders.set_written(f_builder)
         self.logger.debug("Done writing %s '%s' to path '%s'" %
                           (f_builder.__class__.__qualname__, f_builder.name, self.source))
 
-        # Consolidate metadata for the entire file after everything has been written
+        # Consolidate metadata for the entire file after everything has been written. We can skip this step
+        # if no new builders, attributes, or specs have been written and the file already has consolidated metadata.
         if consolidate_metadata:
-            zarr.consolidate_metadata(store=self.path)
+            if (self.__metadata_modified or len(self._written_builders) > num_written_builders
+                    or '.zmetadata' not in self.__file.store):
+                zarr.consolidate_metadata(store=self.__file.store)
+                self.__metadata_modified = False
+        # Files opened while writing may be outdated now and the cached builders are no longer needed
+        self.__clear_caches(write_only=True)
 
     @staticmethod
     def __get_store_path(store):
@@ -476,8 +661,8 @@ class ZarrIO(HDMFIO):
 
         return fpath
 
-    def __open_file_consolidated(self,
-                                 store,
+    @staticmethod
+    def __open_file_consolidated(store,
                                  mode,
                                  synchronizer=None,
                                  storage_options=None):
@@ -488,16 +673,19 @@ class ZarrIO(HDMFIO):
         # This check is just a safeguard for possible errors in the future. But this should never happen
         if mode == 'r-':
             raise ValueError('Mode r- not allowed for reading with consolidated metadata')
+        # Normalize the store only once so that the fallback to zarr.open reuses the same store. Files are
+        # consolidated on write by default, so we try open_consolidated first rather than checking for the
+        # '.zmetadata' key, which would cost an extra request for remote files. storage_options have been
+        # applied by normalize_store_arg.
+        store = normalize_store_arg(store, storage_options=storage_options, mode=mode)
         try:
             return zarr.open_consolidated(store=store,
                                           mode=mode,
-                                          synchronizer=synchronizer,
-                                          storage_options=storage_options)
+                                          synchronizer=synchronizer)
         except KeyError:  # A KeyError is raised when the '/.zmetadata' does not exist
             return zarr.open(store=store,
                              mode=mode,
-                             synchronizer=synchronizer,
-                             storage_options=storage_options)
+                             synchronizer=synchronizer)
 
     @docval({'name': 'parent', 'type': Group, 'doc': 'the parent Zarr object'},
             {'name': 'builder', 'type': GroupBuilder, 'doc': 'the GroupBuilder to write'},
@@ -515,43 +703,117 @@ class ZarrIO(HDMFIO):
         parent, builder, link_data, exhaust_dci, export_source = getargs(
             'parent', 'builder', 'link_data', 'exhaust_dci', 'export_source', kwargs
         )
+        return self.__write_groups(parent=parent,
+                                   builders=[builder],
+                                   link_data=link_data,
+                                   exhaust_dci=exhaust_dci,
+                                   export_source=export_source)[0]
 
-        if self.get_written(builder):
-            group = parent[builder.name]
-        else:
-            group = parent.require_group(builder.name)
-
-        subgroups = builder.groups
-        if subgroups:
-            for subgroup_name, sub_builder in subgroups.items():
-                self.write_group(
-                    parent=group,
-                    builder=sub_builder,
-                    link_data=link_data,
-                    exhaust_dci=exhaust_dci,
-                )
+    def __write_groups(self, parent, builders, link_data, exhaust_dci, export_source):
+        """
+        Write the given GroupBuilders, including all their subgroups, to the parent Zarr Group.
 
-        datasets = builder.datasets
-        if datasets:
-            for dset_name, sub_builder in datasets.items():
-                self.write_dataset(
-                    parent=group,
-                    builder=sub_builder,
-                    link_data=link_data,
-                    exhaust_dci=exhaust_dci,
-                    export_source=export_source,
-                )
+        Rather than recursing into each subgroup, the hierarchy is flattened into a list of groups
+        and written in phases: 1) create all groups, 2) write all datasets, and 3) write all links and
+        attributes. If a thread pool is available, the datasets of the different groups are written
+        in parallel and DataChunkIterators are queued to be exhausted at the end of write_builder.
+        Datasets that may hold references are always written on the calling thread, since creating
+        references may build containers with the BuildManager, which is not thread-safe.
 
-        # write all links (haven implemented)
-        links = builder.links
-        if links:
-            for link_name, sub_builder in links.items():
+        :return: List with the Zarr Group for each of the given builders
+        """
+        # Phase 1: Create all groups. As before, only the given (top-level) builders use the export_source.
+        groups = []  # list of (group, builder, export_source) tuples in breadth-first order
+        worklist = deque((parent, builder, export_source) for builder in builders)
+        while worklist:
+            grp_parent, grp_builder, grp_export_source = worklist.popleft()
+            if self.get_written(grp_builder):
+                group = grp_parent[grp_builder.name]
+            else:
+                group = grp_parent.require_group(grp_builder.name)
+            groups.append((group, grp_builder, grp_export_source))
+            worklist.extend((group, sub_builder, None) for sub_builder in grp_builder.groups.values())
+
+        # Buffer the links added to the groups until the end of phase 3, so that the zarr_link attribute of
+        # each group is written once rather than once per link
+        for group, _, _ in groups:
+            self.__pending_links.set(group, [])
+
+        # Phase 2: Write all datasets
+        if self.__io_pool is not None:
+            futures = []
+            ref_datasets = []  # list of (group, datasets, export_source) tuples to write on the calling thread
+            for group, grp_builder, grp_export_source in groups:
+                datasets, grp_ref_datasets = [], []
+                for sub_builder in grp_builder.datasets.values():
+                    if self.__may_hold_references(sub_builder):
+                        grp_ref_datasets.append(sub_builder)
+                    else:
+                        datasets.append(sub_builder)
+                if datasets:
+                    futures.append(self.__io_pool.submit(self.__write_group_datasets,
+                                                         group=group,
+                                                         datasets=datasets,
+                                                         link_data=link_data,
+                                                         exhaust_dci=False,
+                                                         export_source=grp_export_source))
+                if grp_ref_datasets:
+                    ref_datasets.append((group, grp_ref_datasets, grp_export_source))
+            try:
+                for group, datasets, grp_export_source in ref_datasets:
+                    self.__write_group_datasets(group=group,
+                                                datasets=datasets,
+                                                link_data=link_data,
+                                                exhaust_dci=False,
+                                                export_source=grp_export_source)
+            finally:
+                for future in futures:
+                    future.result()  # wait for the datasets to be written and raise any error
+        else:
+            for group, grp_builder, grp_export_source in groups:
+                self.__write_group_datasets(group=group,
+                                            datasets=grp_builder.datasets.values(),
+                                            link_data=link_data,
+                                            exhaust_dci=exhaust_dci,
+                                            export_source=grp_export_source)
+
+        # Phase 3: Write all links (haven implemented) and attributes. Write the groups bottom-up as
+        # before so that a group is only marked as written once all its subgroups have been written.
+        for group, grp_builder, _ in reversed(groups):
+            for link_name, sub_builder in grp_builder.links.items():
                 self.write_link(group, sub_builder)
+            self.__flush_links__(group)
+            self.write_attributes(group, grp_builder.attributes)
+            self._written_builders.set_written(grp_builder)  # record that the builder has been written
+        return [group for group, _, _ in groups[:len(builders)]]
+
+    def __write_group_datasets(self, group, datasets, link_data, exhaust_dci, export_source):
+        """Write the given DatasetBuilders to the given Zarr Group"""
+        for sub_builder in datasets:
+            self.write_dataset(
+                parent=group,
+                builder=sub_builder,
+                link_data=link_data,
+                exhaust_dci=exhaust_dci,
+                export_source=export_source,
+            )
 
-        attributes = builder.attributes
-        self.write_attributes(group, attributes)
-        self._written_builders.set_written(builder)  # record that the builder has been written
-        return group
+    def __may_hold_references(self, builder):
+        """
+        Check whether writing the DatasetBuilder may require creating references, i.e., calling __get_ref,
+        either for its data or its attributes
+        """
+        dtype = builder.dtype
+        if isinstance(dtype, list):
+            if any(self.__is_ref(dts['dtype']) for dts in dtype):
+                return True
+        elif dtype is not None and self.__is_ref(dtype):
+            return True
+        data = builder.data.data if isinstance(builder.data, ZarrDataIO) else builder.data
+        # When exporting, datasets of containers are written as references
+        if isinstance(data, HDMFDataset):
+            return True
+        return any(isinstance(v, (Container, Builder, ReferenceBuilder)) for v in builder.attributes.values())
 
     @docval({'name': 'obj', 'type': (Group, Array), 'doc': 'the Zarr object to add attributes to'},
             {'name': 'attributes',
@@ -562,32 +824,11 @@ class ZarrIO(HDMFIO):
     def write_attributes(self, **kwargs):
         """Set (i.e., write) the attributes on a given Zarr Group or Array."""
         obj, attributes, export_source = getargs('obj', 'attributes', 'export_source', kwargs)
-
+        if attributes:
+            self.__metadata_modified = True
         for key, value in attributes.items():
-            # Case 1: list, set, tuple type attributes
-            if isinstance(value, (set, list, tuple)) or (isinstance(value, np.ndarray) and np.ndim(value) != 0):
-                # Convert to tuple for writing (e.g., numpy arrays are not JSON serializable)
-                if isinstance(value, np.ndarray):
-                    tmp = tuple(value.tolist())
-                else:
-                    tmp = tuple(value)
-                # Attempt write of the attribute
-                try:
-                    obj.attrs[key] = tmp
-                # Numpy scalars and bytes are not JSON serializable. Try to convert to a serializable type instead
-                except TypeError as e:
-                    try:
-                        tmp = tuple([i.item()
-                                     if (isinstance(i, np.generic) and not isinstance(i, np.bytes_))
-                                     else i.decode("utf-8")
-                                     if isinstance(i, (bytes, np.bytes_))
-                                     else i
-                                     for i in value])
-                        obj.attrs[key] = tmp
-                    except:  # noqa: E722
-                        raise TypeError(str(e) + " type=" + str(type(value)) + "  data=" + str(value)) from e
-            # Case 2: References
-            elif isinstance(value, (Container, Builder, ReferenceBuilder)):
+            # Case 1: References
+            if isinstance(value, (Container, Builder, ReferenceBuilder)):
                 # TODO: Region References are not yet supported
                 # if isinstance(value, RegionBuilder):
                 #     type_str = 'region'
@@ -599,43 +840,72 @@ class ZarrIO(HDMFIO):
                     else:
                         refs = self.__get_ref(value.builder, export_source)
                 tmp = {'zarr_dtype': type_str, 'value': refs}
-                obj.attrs[key] = tmp
-            # Case 3: Scalar attributes
+            # Case 2: numpy arrays. Convert to tuple for writing (numpy arrays are not JSON serializable)
+            elif isinstance(value, np.ndarray) and value.ndim != 0:
+                if value.dtype.kind == 'S':
+                    tmp = tuple(np.char.decode(value, 'utf-8').tolist())
+                elif value.dtype.kind == 'O':
+                    tmp = tuple(self.__get_json_serializable(i) for i in value.tolist())
+                else:
+                    tmp = tuple(value.tolist())
+            # Case 3: list, set, tuple type attributes. Only convert elements if any of them need it
+            elif isinstance(value, (set, list, tuple)):
+                if not any(isinstance(i, JSON_CONVERT_TYPES) for i in value):
+                    tmp = tuple(value)
+                elif all(isinstance(i, bytes) for i in value):
+                    # decode lists of bytes in one vectorized call rather than element by element
+                    tmp = tuple(np.char.decode(np.asarray(list(value)), 'utf-8').tolist())
+                else:
+                    tmp = tuple(self.__get_json_serializable(i) for i in value)
+            # Case 4: Scalar attributes
             else:
-                # Attempt to write the attribute
-                try:
-                    obj.attrs[key] = value
-                # Numpy scalars and bytes are not JSON serializable. Try to convert to a serializable type instead
-                except TypeError as e:
-                    try:
-                        val = value.item if isinstance(value, np.ndarray) else value
-                        val = value.item() \
-                            if (isinstance(value, np.generic) and not isinstance(value, np.bytes_)) \
-                            else val.decode("utf-8") \
-                            if isinstance(value, (bytes, np.bytes_)) \
-                            else val
-                        obj.attrs[key] = val
-                    except:  # noqa: E722
-                        msg = str(e) + "key=" + key + " type=" + str(type(value)) + "  data=" + str(value)
-                        raise TypeError(msg) from e
+                tmp = self.__get_json_serializable(value)
+            try:
+                obj.attrs[key] = tmp
+            except TypeError as e:
+                msg = str(e) + "key=" + key + " type=" + str(type(value)) + "  data=" + str(value)
+                raise TypeError(msg) from e
+
+    @staticmethod
+    def __get_json_serializable(value):
+        """
+        Convert a single attribute value to a JSON serializable type. Numpy scalars are converted
+        to Python scalars and bytes are decoded to str. All other values are returned as is.
+        """
+        if not isinstance(value, JSON_CONVERT_TYPES):
+            return value
+        if isinstance(value, np.ndarray) and value.ndim == 0:
+            value = value[()]
+        if isinstance(value, (bytes, np.bytes_)):
+            return value.decode("utf-8")
+        elif isinstance(value, np.generic):
+            return value.item()
+        return value
 
     def __get_path(self, builder):
         """Get the path to the builder.
         If builder.location is set then it is used as the path, otherwise the function
-        determines the path by constructing it iteratively from the parents of the
-        builder.
+        determines the path by constructing it recursively from the path of the parent
+        of the builder. Paths are cached in self.__path_cache by the id of the builder.
         """
-        if builder.location is not None:
-            path = os.path.normpath(os.path.join(builder.location, builder.name)).replace("\\", "/")
+        cached = self.__path_cache.get(builder)
+        if cached is not None:
+            return cached
+        location = builder.location
+        if location is not None:
+            # Zarr paths are always '/'-separated, so for locations that are already normalized absolute
+            # paths we can simply concatenate the strings. Only fall back to normpath for all other cases.
+            if location.startswith("/") and "\\" not in location and "//" not in location and "/." not in location:
+                path = location.rstrip("/") + "/" + builder.name
+            else:
+                path = os.path.normpath(os.path.join(location, builder.name)).replace("\\", "/")
+        elif builder.name == ROOT_NAME:
+            path = "/"
+        elif builder.parent is None or builder.parent.name == ROOT_NAME:
+            path = "/" + builder.name
         else:
-            curr = builder
-            names = list()
-            while curr is not None and curr.name != ROOT_NAME:
-                names.append(curr.name)
-                curr = curr.parent
-            delim = "/"
-            path = "%s%s" % (delim, delim.join(reversed(names)))
-        return path
+            path = self.__get_path(builder.parent) + "/" + builder.name
+        return self.__path_cache.set(builder, path)
 
     @staticmethod
     def get_zarr_paths(zarr_object):
@@ -648,20 +918,31 @@ class ZarrIO(HDMFIO):
         # In Zarr the path is a combination of the path of the store and the path of the object. So we first need to
         # merge those two paths, then remove the path of the file, add the missing leading "/" and then compute the
         # directory name to get the path of the parent
-        fpath = ZarrIO._ZarrIO__get_store_path(zarr_object.store)
+        fpath, filepath = ZarrIO.__get_zarr_file_path(zarr_object.store)
         fullpath = os.path.normpath(os.path.join(fpath, zarr_object.path)).replace("\\", "/")
-        # To determine the filepath we now iterate over the path and check if the .zgroup object exists at
-        # a level, indicating that we are still within the Zarr file. The first level we hit where the parent
-        # directory does not have a .zgroup means we have found the main file
-        filepath = fullpath
-        while os.path.exists(os.path.join(os.path.dirname(filepath), ".zgroup")):
-            filepath = os.path.dirname(filepath)
         # From the fullpath and filepath we can now compute the objectpath within the zarr file as the relative
         # path from the filepath to the object
         objectpath = "/" + os.path.relpath(fullpath, filepath)
         # return the result
         return filepath, objectpath
 
+    @staticmethod
+    def __get_zarr_file_path(store):
+        """
+        Get the path of the given store and the path of the main Zarr file containing the store
+        :return: Tuple of two strings with: 1) the normalized path of the store and 2) the path of the Zarr file
+        """
+        fpath = os.path.normpath(ZarrIO._ZarrIO__get_store_path(store)).replace("\\", "/")
+        # To determine the filepath we now iterate over the path and check if the .zgroup object exists at
+        # a level, indicating that we are still within the Zarr file. The first level we hit where the parent
+        # directory does not have a .zgroup means we have found the main file. All levels below the root of
+        # the store are part of the file, so we can start the search at the root of the store. In the common
+        # case where the store is the main file this requires only a single check.
+        filepath = fpath
+        while os.path.exists(os.path.join(os.path.dirname(filepath), ".zgroup")):
+            filepath = os.path.dirname(filepath)
+        return fpath, filepath
+
     @staticmethod
     def get_zarr_parent_path(zarr_object):
         """
@@ -674,6 +955,20 @@ class ZarrIO(HDMFIO):
         parentpath = os.path.dirname(objectpath)
         return parentpath
 
+    def __get_zarr_parent_path(self, zarr_obj):
+        """
+        Same as get_zarr_parent_path, but the paths of the store and of the Zarr file containing it are
+        cached in self.__zarr_file_path_cache by id(store), so that the file system is only checked once
+        per store rather than once per object when reading a file
+        """
+        store = zarr_obj.store
+        cached = self.__zarr_file_path_cache.get(store)
+        if cached is None:
+            cached = self.__zarr_file_path_cache.set(store, self.__get_zarr_file_path(store))
+        fpath, filepath = cached
+        fullpath = os.path.normpath(os.path.join(fpath, zarr_obj.path)).replace("\\", "/")
+        return os.path.dirname("/" + os.path.relpath(fullpath, filepath))
+
     @staticmethod
     def is_zarr_file(path):
         """
@@ -681,11 +976,8 @@ class ZarrIO(HDMFIO):
         :param path: Full path to main directory
         :return: Bool
         """
-        if os.path.exists(path):
-            if os.path.isdir(path):
-                if os.path.exists(os.path.join(path, ".zgroup")):
-                    return True
-        return False
+        # A single stat of the .zgroup file suffices, since it can only exist if path is a directory
+        return os.path.exists(os.path.join(path, ".zgroup"))
 
     def __is_ref(self, dtype):
         if isinstance(dtype, DtypeSpec):
@@ -707,6 +999,21 @@ class ZarrIO(HDMFIO):
         :return: 1) name of the target object
                  2) the target zarr object within the target file
         """
+        return self.__resolve_ref(zarr_ref)[:2]
+
+    def __resolve_ref(self, zarr_ref):
+        """
+        Same as :py:meth:`resolve_ref` but also return whether the target zarr object is a group
+
+        :return: 1) name of the target object
+                 2) the target zarr object within the target file
+                 3) bool indicating whether the target zarr object is a zarr.hierarchy.Group
+        """
+        # References to the same object resolve to the same target, e.g., for the many links to the same table
+        cache_key = (zarr_ref.get('source', None), zarr_ref.get('path', None))
+        cached = self.__resolved_ref_cache.get(cache_key)
+        if cached is not None:
+            return cached
         # Extract the path as defined in the zarr_ref object
         if zarr_ref.get('source', None) is None:
             source_file = str(zarr_ref['path'])
@@ -727,16 +1034,35 @@ class ZarrIO(HDMFIO):
         else:
             target_name = ROOT_NAME
 
-        target_zarr_obj = self.__open_file_consolidated(store=source_file,
-                                                        mode='r',
-                                                        storage_options=self.__storage_options)
+        # Open each target file only once rather than once per reference
+        target_zarr_obj = self.__open_file_cache.get(source_file)
+        if target_zarr_obj is None:
+            target_zarr_obj = self.__open_file_consolidated(store=source_file,
+                                                            mode='r',
+                                                            storage_options=self.__storage_options)
+            self.__open_file_cache[source_file] = target_zarr_obj
         if object_path is not None:
             try:
                 target_zarr_obj = target_zarr_obj[object_path]
             except Exception:
                 raise ValueError("Found bad link to object %s in file %s" % (object_path, source_file))
+        ret = (target_name, target_zarr_obj, isinstance(target_zarr_obj, Group))
+        self.__resolved_ref_cache[cache_key] = ret
         # Return the create path
-        return target_name, target_zarr_obj
+        return ret
+
+    def __read_ref_target(self, zarr_ref):
+        """
+        Get the builder for the target of the given zarr reference
+
+        :param zarr_ref: Dict with `source` and `path` keys or a `ZarrReference` object
+        :returns: GroupBuilder or DatasetBuilder of the target object
+        """
+        target_name, target_zarr_obj, is_group = self.__resolve_ref(zarr_ref)
+        # NOTE: __read_group and __read_dataset return the cached builders if the target has already been built
+        if is_group:
+            return self.__read_group(target_zarr_obj, target_name)
+        return self.__read_dataset(target_zarr_obj, target_name)
 
     def __get_ref(self, ref_object, export_source=None):
         """
@@ -746,9 +1072,12 @@ class ZarrIO(HDMFIO):
         :type ref_object: Builder, Container, ReferenceBuilder
         :returns: ZarrReference object
         """
-        if isinstance(ref_object, RegionBuilder):  # or region is not None: TODO: Add to support regions
+        # Fast path for the most common case of references to plain group and dataset builders
+        if type(ref_object) in (GroupBuilder, DatasetBuilder):
+            builder = ref_object
+        elif isinstance(ref_object, RegionBuilder):  # or region is not None: TODO: Add to support regions
             raise NotImplementedError("Region references are currently not supported by ZarrIO")
-        if isinstance(ref_object, Builder):
+        elif isinstance(ref_object, Builder):
             if isinstance(ref_object, LinkBuilder):
                 builder = ref_object.target_builder
             else:
@@ -757,6 +1086,11 @@ class ZarrIO(HDMFIO):
             builder = ref_object.builder
         else:
             builder = self.manager.build(ref_object)
+        # References to the same builder are identical within a write, so we only need to create them once.
+        # The cached ZarrReference objects are shared and must therefore not be modified by the callers.
+        cached = self.__ref_cache.get(builder, key=export_source is not None)
+        if cached is not None:
+            return cached
         path = self.__get_path(builder)
         # TODO Add to get region for region references.
         #      Also add  {'name': 'region', 'type': (slice, list, tuple),
@@ -765,15 +1099,13 @@ class ZarrIO(HDMFIO):
         #    region = ref_object.region
 
         # get the object id if available
-        object_id = builder.get('object_id', None)
+        object_id = builder.attributes.get('object_id', None)
 
         # determine the object_id of the source by following the parents of the builder until we find the root
         # the root builder should be the same as the source file containing the reference
-        curr = builder
-        while curr is not None and curr.name != ROOT_NAME:
-            curr = curr.parent
+        curr = self.__get_root_builder(builder)
         if curr:
-            source_object_id = curr.get('object_id', None)
+            source_object_id = curr.attributes.get('object_id', None)
         # We did not find ROOT_NAME as a parent. This should only happen if we have an invalid
         # file as a source, e.g., if during testing we use an arbitrary builder. We check this
         # anyways to avoid potential errors just in case
@@ -782,12 +1114,6 @@ class ZarrIO(HDMFIO):
             warn_msg = "Could not determine source_object_id for builder with path: %s" % path
             warnings.warn(warn_msg)
 
-        # by checking os.isdir makes sure we have a valid link path to a dir for Zarr. For conversion
-        # between backends a user should always use export which takes care of creating a clean set of builders.
-        source = (builder.source
-                  if (builder.source is not None and os.path.isdir(builder.source))
-                  else self.source)
-
         # Make the source relative to the current file
         # TODO: This check assumes that all links are internal links on export.
         # Need to deal with external links on export.
@@ -796,14 +1122,50 @@ class ZarrIO(HDMFIO):
             # and not the original source when exporting.
             source = '.'
         else:
-            source = os.path.relpath(os.path.abspath(source), start=self.abspath)
+            source = self.__get_ref_source(builder.source)
         # Return the ZarrReference object
         ref = ZarrReference(
             source=source,
             path=path,
             object_id=object_id,
             source_object_id=source_object_id)
-        return ref
+        return self.__ref_cache.set(builder, ref, key=export_source is not None)
+
+    def __get_root_builder(self, builder):
+        """
+        Get the root builder (i.e., the builder named ROOT_NAME) by following the parents of the builder.
+        Returns None if the builder does not have a root. Results are cached in self.__root_cache by the id
+        of the builders along the way, so that repeated lookups for builders of the same tree are O(1).
+        """
+        chain = []
+        curr = builder
+        while curr is not None and curr.name != ROOT_NAME:
+            cached = self.__root_cache.get(curr)
+            if cached is not None:
+                curr = cached
+                break
+            chain.append(curr)
+            curr = curr.parent
+        for b in chain:
+            self.__root_cache.set(b, curr)
+        return curr
+
+    def __get_ref_source(self, builder_source):
+        """
+        Get the source of a reference to a builder with the given source relative to the current file.
+        Results are cached in self.__ref_source_cache by the builder source, which avoids repeating the
+        same filesystem checks and path computations for each reference.
+        """
+        source = self.__ref_source_cache.get(builder_source)
+        if source is None:
+            # by checking os.isdir makes sure we have a valid link path to a dir for Zarr. For conversion
+            # between backends a user should always use export which takes care of creating a clean set of builders.
+            source = (builder_source
+                      if (builder_source is not None and os.path.isdir(builder_source))
+                      else self.source)
+            source = os.path.relpath(os.path.abspath(source), start=self.abspath)
+            self.__ref_source_cache[builder_source] = source
+        return source
 
     def __add_link__(self, parent, target_source, target_path, link_name):
         """
@@ -816,11 +1178,23 @@ class ZarrIO(HDMFIO):
         :param link_name: Name of the link
         :type link_name: str
         """
-        if 'zarr_link' not in parent.attrs:
-            parent.attrs['zarr_link'] = []
-        zarr_link = list(parent.attrs['zarr_link'])
-        zarr_link.append({'source': target_source, 'path': target_path, 'name': link_name})
-        parent.attrs['zarr_link'] = zarr_link
+        link = {'source': target_source, 'path': target_path, 'name': link_name}
+        pending = self.__pending_links.get(parent)
+        if pending is not None:
+            # the group is being written by __write_groups, which writes all its links at once
+            pending.append(link)
+        else:
+            parent.attrs['zarr_link'] = list(parent.attrs.get('zarr_link', [])) + [link]
+
+    def __flush_links__(self, parent):
+        """
+        Write the links buffered for the parent group to its zarr_link attribute in a single update
+        :param parent: The parent Zarr group containing the links
+        :type parent: zarr.hierarchy.Group
+        """
+        pending = self.__pending_links.pop(parent)
+        if pending:
+            parent.attrs['zarr_link'] = list(parent.attrs.get('zarr_link', [])) + pending
 
     @docval({'name': 'parent', 'type': Group, 'doc': 'the parent Zarr object'},
             {'name': 'builder', 'type': LinkBuilder, 'doc': 'the LinkBuilder to write'})
@@ -833,8 +1207,8 @@ class ZarrIO(HDMFIO):
         self.logger.debug("Writing LinkBuilder '%s' to parent group '%s'" % (builder.name, parent.name))
         name = builder.name
         target_builder = builder.builder
-        # Get the reference
-        zarr_ref = self.__get_ref(target_builder)
+        # Get the reference. Copy it since the reference is shared with other users of __get_ref and may be updated
+        zarr_ref = ZarrReference(**self.__get_ref(target_builder))
         # EXPORT WITH LINKS: Fix link source
         # if the target and source are both the same, then we need to ALWAYS use ourselves as a source
         # When exporting from one source to another, the LinkBuilders.source are not updated, i.e,. the
@@ -877,6 +1251,22 @@ class ZarrIO(HDMFIO):
         self.__add_link__(parent, zarr_ref.source, zarr_ref.path, name)
         self._written_builders.set_written(builder)  # record that the builder has been written
 
+    @staticmethod
+    def __iter_large_dataset(data, dtype):
+        """
+        Wrap a numeric array (e.g., a h5py.Dataset) larger than HDMFDATASET_STREAM_SIZE in a DataChunkIterator
+        that reads it in blocks of about HDMFDATASET_STREAM_SIZE bytes. This is a helper function for write_dataset()
+
+        :param data: The array to be written
+        :param dtype: The dtype of the array
+        :returns: The DataChunkIterator or None if the array is not numeric or small enough to be loaded at once
+        """
+        if not (isinstance(dtype, np.dtype) and dtype.kind in NUMERIC_DTYPE_KINDS and
+                np.prod(data.shape, dtype=np.int64) * dtype.itemsize > HDMFDATASET_STREAM_SIZE):
+            return None
+        row_size = np.prod(data.shape[1:], dtype=np.int64) * dtype.itemsize
+        return DataChunkIterator(data=data, buffer_size=max(1, int(HDMFDATASET_STREAM_SIZE // row_size)))
+
     @classmethod
     def __setup_chunked_dataset__(cls, parent, name, data, options=None):
         """
@@ -937,7 +1327,7 @@ class ZarrIO(HDMFIO):
 
         force_data = getargs('force_data', kwargs)
 
-        if exhaust_dci and self.__dci_queue is None:
+        if self.__dci_queue is None:
             self.__dci_queue = ZarrIODataChunkIteratorQueue()
 
         if self.get_written(builder):
@@ -956,6 +1346,16 @@ class ZarrIO(HDMFIO):
             data = data.data
         else:
             options['io_settings'] = {}
+        # Large numeric h5py.Datasets are copied in blocks via a DataChunkIterator to limit memory use
+        if ZarrDataIO.is_h5py_dataset(data):
+            data_iter = self.__iter_large_dataset(data, data.dtype)
+            if data_iter is not None:
+                # Copy the io_settings since __setup_chunked_dataset__ adds the shape and dtype to them
+                options['io_settings'] = dict(options['io_settings'])
+                data = data_iter
+        # Use the default compressor if none is specified. Copy the io_settings to avoid modifying the ZarrDataIO
+        if 'compressor' not in options['io_settings']:
+            options['io_settings'] = dict(options['io_settings'], compressor=DEFAULT_COMPRESSOR)
 
         attributes = builder.attributes
         options['dtype'] = builder.dtype
@@ -978,13 +1378,17 @@ class ZarrIO(HDMFIO):
         elif isinstance(data, HDMFDataset):
             # If we have a dataset of containers we need to make the references to the containers
             if len(data) > 0 and isinstance(data[0], Container):
-                ref_data = [self.__get_ref(data[i], export_source=export_source) for i in range(len(data))]
+                # Fill a preallocated object array rather than building a list and converting it
                 shape = (len(data), )
+                ref_data = np.empty(shape, dtype=object)
+                get_ref = self.__get_ref
+                for i in range(len(data)):
+                    ref_data[i] = get_ref(data[i], export_source=export_source)
                 type_str = 'object'
                 dset = parent.require_dataset(name,
                                               shape=shape,
                                               dtype=object,
-                                              object_codec=self.__codec_cls(),
+                                              object_codec=self.__codec,
                                               **options['io_settings'])
                 dset.attrs['zarr_dtype'] = type_str
                 dset[:] = ref_data
@@ -998,10 +1402,15 @@ class ZarrIO(HDMFIO):
                 # We can/should not update the data in the builder itself so we load the data here and instead
                 # force write_dataset when we call it recursively to use the data we loaded, rather than the
                 # dataset that is set on the builder
+                # Large numeric datasets are copied in blocks via a DataChunkIterator to limit memory use
+                force_data = self.__iter_large_dataset(data.dataset, getattr(data, 'dtype', None))
+                if force_data is None:
+                    force_data = data[:]
                 dset = self.write_dataset(parent=parent,
                                           builder=builder,
                                           link_data=link_data,
-                                          force_data=data[:],
+                                          exhaust_dci=exhaust_dci,
+                                          force_data=force_data,
                                           export_source=export_source)
                 self._written_builders.set_written(builder)  # record that the builder has been written
         # Write a compound dataset
@@ -1026,14 +1435,6 @@ class ZarrIO(HDMFIO):
 
                 self._written_builders.set_written(builder)  # record that the builder has been written
 
-                # gather items to write
-                new_items = []
-                for j, item in enumerate(data):
-                    new_item = list(item)
-                    for i in refs:
-                        new_item[i] = self.__get_ref(item[i], export_source=export_source)
-                    new_items.append(tuple(new_item))
-
                 # Create dtype for storage, replacing values to match hdmf's hdf5 behavior
                 # ---
                 # TODO: Replace with a simple one-liner once __resolve_dtype_helper__ is
@@ -1056,13 +1457,26 @@ class ZarrIO(HDMFIO):
                         new_dtype.append((field['name'], self.__resolve_dtype_helper__(field['dtype'])))
                 dtype = np.dtype(new_dtype)
 
-                # cast and store compound dataset
-                arr = np.array(new_items, dtype=dtype)
+                # gather items to write column by column, rather than converting each row to a tuple
+                arr = np.empty(len(data), dtype=dtype)
+                get_refs = np.frompyfunc(lambda ref: self.__get_ref(ref, export_source=export_source), 1, 1)
+                for i, field_name in enumerate(dtype.names):
+                    if i in refs:
+                        # fill the objects one by one, since numpy may otherwise try to iterate over them
+                        column = np.empty(len(data), dtype=object)
+                        for j, item in enumerate(data):
+                            column[j] = item[i]
+                        column = get_refs(column)
+                    else:
+                        column = [item[i] for item in data]
+                    arr[field_name] = column
+
+                # store compound dataset
                 dset = parent.require_dataset(
                     name,
                     shape=(len(arr),),
                     dtype=dtype,
-                    object_codec=self.__codec_cls(),
+                    object_codec=self.__compound_codec,
                     **options['io_settings']
                 )
                 dset.attrs['zarr_dtype'] = type_str
@@ -1089,22 +1503,28 @@ class ZarrIO(HDMFIO):
             else:
                 shape = (len(data), )
                 type_str = 'object'
-                refs = [self.__get_ref(item, export_source=export_source) for item in data]
+                refs = np.empty(shape, dtype=object)
+                get_ref = self.__get_ref
+                for i, item in enumerate(data):
+                    refs[i] = get_ref(item, export_source=export_source)
 
             dset = parent.require_dataset(name,
                                           shape=shape,
                                           dtype=object,
-                                          object_codec=self.__codec_cls(),
+                                          object_codec=self.__codec,
                                           **options['io_settings'])
             self._written_builders.set_written(builder)  # record that the builder has been written
             dset.attrs['zarr_dtype'] = type_str
-            if hasattr(refs, '__len__'):
-                dset[:] = np.array(refs)
+            if isinstance(refs, np.ndarray):
+                dset[:] = refs
             else:
                 dset[0] = refs
         # write a 'regular' dataset without DatasetIO info
         else:
-            if isinstance(data, (str, bytes)):
+            fill_method = self.__fill_methods.get(type(data))
+            if fill_method is not None:
+                dset = fill_method(self, parent, name, data, options)
+            elif isinstance(data, (str, bytes)):
                 dset = self.__scalar_fill__(parent, name, data, options)
             # Iterative write of a data chunk iterator
             elif isinstance(data, AbstractDataChunkIterator):
@@ -1124,7 +1544,7 @@ class ZarrIO(HDMFIO):
             self.__dci_queue.exhaust_queue()
         return dset
 
-    __dtypes = {
+    __dtypes = MappingProxyType({
         "float": np.float32,
         "float32": np.float32,
         "double": np.float64,
@@ -1154,27 +1574,30 @@ class ZarrIO(HDMFIO):
         "reference": ZarrReference,
         "object": ZarrReference,
         "region": ZarrReference,
-    }
+    })
 
     @classmethod
     def __serial_dtype__(cls, dtype):
         if isinstance(dtype, type):
             return dtype.__name__
         elif isinstance(dtype, np.dtype):
-            if dtype.names is None:
-                return dtype.type.__name__
-            else:
-                ret = list()
-                for n in dtype.names:
-                    item = dict()
-                    item['name'] = n
-                    item['dtype'] = cls.__serial_dtype__(dtype[n])
-                    ret.append(item)
-                return ret
+            return cls.__serial_numpy_dtype(dtype)
         # TODO Does not work when Reference in compound datatype
         elif dtype == ZarrReference:
             return 'object'
 
+    @staticmethod
+    def __serial_numpy_dtype(dtype):
+        """
+        Serialize a numpy dtype for the zarr_dtype attribute.
+
+        The result is not cached by dtype. Dtypes that compare and hash equal may still serialize to
+        different names, e.g., np.dtype('q') and np.dtype('l') to 'longlong' and 'int64'.
+        """
+        if dtype.names is None:
+            return dtype.type.__name__
+        return [{'name': n, 'dtype': ZarrIO.__serial_numpy_dtype(dtype[n])} for n in dtype.names]
+
     @classmethod
     def __resolve_dtype__(cls, dtype, data):
         dtype = cls.__resolve_dtype_helper__(dtype)
@@ -1210,10 +1633,11 @@ class ZarrIO(HDMFIO):
                 raise ValueError('cannot determine type for empty data')
             return cls.get_type(data[0])
 
-    __reserve_attribute = ('zarr_dtype', 'zarr_link')
+    __reserve_attribute = frozenset(('zarr_dtype', 'zarr_link'))
 
     def __list_fill__(self, parent, name, data, options=None):  # noqa: C901
         dtype = None
+        is_compound = False
         io_settings = dict()
         if options is not None:
             dtype = options.get('dtype')
@@ -1234,7 +1658,7 @@ class ZarrIO(HDMFIO):
         if 'shape' in io_settings:  # Use the shape set by the user
             data_shape = io_settings.pop('shape')
         # If we have a numeric numpy-like array (e.g., numpy.array or h5py.Dataset) then use its shape
-        elif isinstance(dtype, np.dtype) and np.issubdtype(dtype, np.number) or dtype == np.bool_:
+        elif isinstance(dtype, np.dtype) and dtype.kind in NUMERIC_DTYPE_KINDS or dtype == np.bool_:
             # HDMF's get_data_shape may return the maxshape of an HDF5 dataset which can include None values
             # which Zarr does not allow for dataset shape. Check for the shape attribute first before falling
             # back on get_data_shape
@@ -1249,13 +1673,14 @@ class ZarrIO(HDMFIO):
             data_shape = (len(data), )
             # if we have a compound data type
             if dtype.names:
+                is_compound = True
                 data_shape = get_data_shape(data)
                 # If strings are part of our compound type then we need to use Object type instead
                 # otherwise we try to keep the native compound datatype that numpy is using
                 for substype in dtype.fields.items():
-                    if np.issubdtype(substype[1][0], np.flexible) or np.issubdtype(substype[1][0], np.object_):
+                    if substype[1][0].kind in FLEXIBLE_OR_OBJECT_DTYPE_KINDS:
                         dtype = object
-                        io_settings['object_codec'] = self.__codec_cls()
+                        io_settings['object_codec'] = self.__compound_codec
                         break
             # sometimes bytes and strings can hide as object in numpy array so lets try
             # to write those as strings and bytes rather than as objects
@@ -1269,7 +1694,7 @@ class ZarrIO(HDMFIO):
             # Set encoding for objects
             else:
                 dtype = object
-                io_settings['object_codec'] = self.__codec_cls()
+                io_settings['object_codec'] = self.__codec
         # Determine the shape from the data if all other cases have not been hit
         else:
             data_shape = get_data_shape(data)
@@ -1280,18 +1705,37 @@ class ZarrIO(HDMFIO):
 
         # Write the data to file
         if dtype == object:
-            for c in np.ndindex(data_shape):
-                o = data
-                for i in c:
-                    o = o[i]
+            # MsgPack cannot encode numpy scalars, e.g., np.int64 or np.bool_, so convert them to Python scalars
+            if any(isinstance(f, numcodecs.MsgPack) for f in dset.filters or ()):
+                to_serializable, to_serializable_array = self.__to_msgpack_serializable, self.__to_msgpack_array
+            else:
+                to_serializable, to_serializable_array = self.__decode_bytes_value, self.__decode_bytes
+            arr = None
+            # Converting compound data to an array of objects would turn its records (e.g., np.void) into
+            # plain tuples, so compound data is written one element at a time to keep the field names
+            if not is_compound:
+                try:
+                    arr = np.asarray(data, dtype=object)
+                except ValueError:  # e.g., ragged data
+                    pass
+            if arr is not None and arr.shape == tuple(data_shape):
                 # bytes are not JSON serializable
-                dset[c] = o if not isinstance(o, (bytes, np.bytes_)) else o.decode("utf-8")
+                dset[...] = to_serializable_array(arr)
+            else:
+                # Fall back to writing the elements one at a time for compound data or if the data cannot be
+                # converted to an array of objects with the shape of the dataset, e.g., for ragged data
+                for c in np.ndindex(data_shape):
+                    o = data
+                    for i in c:
+                        o = o[i]
+                    # bytes are not JSON serializable
+                    dset[c] = to_serializable(o)
             return dset
         # standard write
         else:
             try:
-                dset[:] = np.array(data)
-            # If data is an h5py.Dataset then this will copy the data
+                # np.asarray avoids copying numpy arrays and reads h5py.Datasets into memory only once
+                dset[:] = np.asarray(data)
             # For compound data types containing strings Zarr sometimes does not like writing multiple values
             # try to write them one-at-a-time instead then
             except ValueError:
@@ -1299,6 +1743,29 @@ class ZarrIO(HDMFIO):
                     dset[i] = data[i]
         return dset
 
+    @staticmethod
+    def __decode_bytes_value(o):
+        """Decode bytes to str, leaving all other objects untouched"""
+        return o.decode("utf-8") if isinstance(o, (bytes, np.bytes_)) else o
+
+    @staticmethod
+    def __to_msgpack_serializable(o):
+        """
+        Decode bytes to str and convert numpy scalars to Python scalars, also within (nested) lists and tuples,
+        since MsgPack cannot encode numpy scalars that are not subclasses of Python types, e.g., np.int64
+        """
+        if isinstance(o, (bytes, np.bytes_)):
+            return o.decode("utf-8")
+        elif isinstance(o, np.generic):
+            return o.item()
+        elif isinstance(o, (list, tuple)):
+            return [ZarrIO.__to_msgpack_serializable(i) for i in o]
+        return o
+
+    # Elementwise versions of __decode_bytes_value and __to_msgpack_serializable for object arrays
+    __decode_bytes = staticmethod(np.frompyfunc(__decode_bytes_value.__func__, 1, 1))
+    __to_msgpack_array = staticmethod(np.frompyfunc(__to_msgpack_serializable.__func__, 1, 1))
+
     def __scalar_fill__(self, parent, name, data, options=None):
         dtype = None
         io_settings = dict()
@@ -1314,24 +1781,55 @@ class ZarrIO(HDMFIO):
                 msg = 'cannot add %s to %s - could not determine type' % (name, parent.name)
                 raise Exception(msg) from exc
         if dtype == object:
-            io_settings['object_codec'] = self.__codec_cls()
+            io_settings['object_codec'] = self.__codec
+            if isinstance(self.__codec, numcodecs.MsgPack):
+                data = self.__to_msgpack_serializable(data)
 
-        dset = parent.require_dataset(name, shape=(1, ), dtype=dtype, **io_settings)
-        dset[:] = data
+        # Create the dataset together with its data rather than creating it first and then assigning the data
+        dset = parent.create_dataset(name, data=np.asarray([data]), dtype=dtype, **io_settings)
         type_str = 'scalar'
         dset.attrs['zarr_dtype'] = type_str
         return dset
 
+    # Fill methods for the most common exact types of data of regular datasets. This lets write_dataset skip
+    # the chain of isinstance checks for these types
+    __fill_methods = MappingProxyType({
+        np.ndarray: __list_fill__,
+        list: __list_fill__,
+        tuple: __list_fill__,
+        str: __scalar_fill__,
+        bytes: __scalar_fill__,
+        int: __scalar_fill__,
+        float: __scalar_fill__,
+        bool: __scalar_fill__,
+    })
+
     @docval(returns='a GroupBuilder representing the NWB Dataset', rtype='GroupBuilder')
     def read_builder(self):
-        f_builder = self.__read_group(self.__file, ROOT_NAME)
+        # For remote files, sibling datasets are fetched in parallel to overlap the latency of the requests
+        if self.is_remote():
+            self.__start_io_pool(REMOTE_READ_JOBS)
+        try:
+            f_builder = self.__read_group(self.__file, ROOT_NAME)
+        finally:
+            self.__stop_io_pool()
         return f_builder
 
     def __set_built(self, zarr_obj, builder):
-        fpath = self.__get_store_path(zarr_obj.store)
-        path = zarr_obj.path
-        path = os.path.join(fpath, path)
-        self.__built.setdefault(path, builder)
+        self.__built.setdefault(self.__get_built_key(zarr_obj), builder)
+
+    def __get_built_key(self, zarr_obj):
+        """
+        Get the key of the given Zarr object in the self.__built cache, i.e., the path of its store joined with
+        its path. The store paths are cached in self.__store_path_cache by id(store), since all objects read
+        from a file typically share the same store. The keys are only used internally, so we can join them
+        with a plain string concatenation rather than with os.path.join.
+        """
+        store = zarr_obj.store
+        cached = self.__store_path_cache.get(store)
+        if cached is None:
+            cached = self.__store_path_cache.set(store, self.__get_store_path(store) + '/')
+        return cached + zarr_obj.path
 
     @docval({'name': 'zarr_obj', 'type': (Array, Group),
              'doc': 'the Zarr object to the corresponding Container/Data object for'})
@@ -1369,39 +1867,55 @@ class ZarrIO(HDMFIO):
         :return: Builder in the self.__built cache or None
         """
 
-        fpath = self.__get_store_path(zarr_obj.store)
-        path = zarr_obj.path
-        path = os.path.join(fpath, path)
-        return self.__built.get(path, None)
+        return self.__built.get(self.__get_built_key(zarr_obj), None)
 
     def __read_group(self, zarr_obj, name=None):
         ret = self.__get_built(zarr_obj)
         if ret is not None:
             return ret
 
-        if name is None:
-            name = str(os.path.basename(zarr_obj.name))
-
-        # Create the GroupBuilder
-        attributes = self.__read_attrs(zarr_obj)
-        ret = GroupBuilder(name=name, source=self.source, attributes=attributes)
-        ret.location = ZarrIO.get_zarr_parent_path(zarr_obj)
-
-        # read sub groups
-        for sub_name, sub_group in zarr_obj.groups():
-            sub_builder = self.__read_group(sub_group, sub_name)
-            ret.set_group(sub_builder)
-
-        # read sub datasets
-        for sub_name, sub_array in zarr_obj.arrays():
-            sub_builder = self.__read_dataset(sub_array, sub_name)
-            ret.set_dataset(sub_builder)
+        # Read the hierarchy with an explicit stack rather than recursively. The groups are visited in the
+        # same depth-first order as a recursive read, and each group is only finished (i.e., its datasets and
+        # links are read and it is recorded as built) after all its subgroups have been finished.
+        # Each stack entry is a tuple (zarr_group, name, parent_builder, builder), where builder is None
+        # if the group still has to be started and is the GroupBuilder of the group if it has to be finished.
+        stack = [(zarr_obj, name, None, None)]
+        while stack:
+            group, group_name, parent, builder = stack.pop()
+            if builder is None:
+                builder = self.__get_built(group)
+                if builder is None:
+                    if group_name is None:
+                        group_name = str(os.path.basename(group.name))
+                    # Create the GroupBuilder
+                    attributes = self.__read_attrs(group)
+                    builder = GroupBuilder(name=group_name, source=self.source, attributes=attributes)
+                    builder.location = self.__get_zarr_parent_path(group)
+                    # read sub groups before finishing the group
+                    stack.append((group, group_name, parent, builder))
+                    stack.extend((sub_group, sub_name, builder, None)
+                                 for sub_name, sub_group in reversed(list(group.groups())))
+                    continue
+            else:
+                # read sub datasets
+                arrays = list(group.arrays())
+                if self.__io_pool is not None and len(arrays) > 1:
+                    scalars = self.__io_pool.map(self.__prefetch_dataset, (sub_array for _, sub_array in arrays))
+                else:
+                    scalars = (None for _ in arrays)
+                for (sub_name, sub_array), scalar in zip(arrays, scalars):
+                    sub_builder = self.__read_dataset(sub_array, sub_name, scalar)
+                    builder.set_dataset(sub_builder)
 
-        # read the links
-        self.__read_links(zarr_obj=zarr_obj, parent=ret)
+                # read the links
+                self.__read_links(zarr_obj=group, parent=builder)
 
-        self._written_builders.set_written(ret)  # record that the builder has been written
-        self.__set_built(zarr_obj, ret)
+                self._written_builders.set_written(builder)  # record that the builder has been written
+                self.__set_built(group, builder)
+            if parent is None:
+                ret = builder
+            else:
+                parent.set_group(builder)
         return ret
 
     def __read_links(self, zarr_obj, parent):
@@ -1413,58 +1927,60 @@ class ZarrIO(HDMFIO):
         :type parent: GroupBuilder
         """
         # read links
-        if 'zarr_link' in zarr_obj.attrs:
-            links = zarr_obj.attrs['zarr_link']
+        links = zarr_obj.attrs.asdict().get('zarr_link')
+        if links is not None:
             for link in links:
                 link_name = link['name']
-                target_name, target_zarr_obj = self.resolve_ref(link)
-                # NOTE: __read_group and __read_dataset return the cached builders if the target has already been built
-                if isinstance(target_zarr_obj, Group):
-                    builder = self.__read_group(target_zarr_obj, target_name)
-                else:
-                    builder = self.__read_dataset(target_zarr_obj, target_name)
+                builder = self.__read_ref_target(link)
                 link_builder = LinkBuilder(builder=builder, name=link_name, source=self.source)
                 link_builder.location = os.path.join(parent.location, parent.name)
                 self._written_builders.set_written(link_builder)  # record that the builder has been written
                 parent.set_link(link_builder)
 
-    def __read_dataset(self, zarr_obj, name):
+    @staticmethod
+    def __prefetch_dataset(zarr_obj):
+        """
+        Fetch the attributes of the given Zarr array, which are then cached by the array, and its value if it is a
+        scalar dataset. Only reads from the store, so that it can be called for many datasets in parallel.
+        :return: The value of the scalar dataset or None if the dataset is not a scalar
+        """
+        if zarr_obj.attrs.asdict().get('zarr_dtype') == 'scalar':
+            return zarr_obj[()]
+        return None
+
+    def __read_dataset(self, zarr_obj, name, scalar=None):
+        """
+        Read the DatasetBuilder for the given Zarr array
+        :param scalar: The value of the dataset if it is a scalar and has already been read by __prefetch_dataset
+        """
         ret = self.__get_built(zarr_obj)
         if ret is not None:
             return ret
 
-        if 'zarr_dtype' in zarr_obj.attrs:
-            zarr_dtype = zarr_obj.attrs['zarr_dtype']
-        elif hasattr(zarr_obj, 'dtype'):   # Fallback for invalid files that are missing zarr_type
-            zarr_dtype = zarr_obj.dtype
+        zarr_dtype = zarr_obj.attrs.asdict().get('zarr_dtype')
+        if zarr_dtype is None:
+            # Fallback for invalid files that are missing zarr_type
+            zarr_dtype = getattr(zarr_obj, 'dtype', None)
+            if zarr_dtype is None:
+                raise ValueError("Dataset missing zarr_dtype: " + str(name) + "   " + str(zarr_obj))
             warnings.warn(
                 "Inferred dtype from zarr type. Dataset missing zarr_dtype: " + str(name) + "   " + str(zarr_obj)
             )
-        else:
-            raise ValueError("Dataset missing zarr_dtype: " + str(name) + "   " + str(zarr_obj))
 
-        kwargs = {"attributes": self.__read_attrs(zarr_obj),
-                  "dtype": zarr_dtype,
-                  "maxshape": zarr_obj.shape,
-                  "chunks": not (zarr_obj.shape == zarr_obj.chunks),
-                  "source": self.source}
-        dtype = kwargs['dtype']
+        attributes = self.__read_attrs(zarr_obj)
+        dtype = zarr_dtype
 
         # By default, use the zarr.core.Array as data for lazy data load
         data = zarr_obj
 
         # Read scalar dataset
         if dtype == 'scalar':
-            data = zarr_obj[()]
+            data = zarr_obj[()] if scalar is None else scalar
 
         if isinstance(dtype, list):
             # Check compound dataset where one of the subsets contains references
-            has_reference = False
-            for i, dts in enumerate(dtype):
-                if dts['dtype'] in ['object', 'region']:  # check items for object reference
-                    has_reference = True
-                    break
             retrieved_dtypes = [dtype_dict['dtype'] for dtype_dict in dtype]
+            has_reference = any(dts in ('object', 'region') for dts in retrieved_dtypes)
             if has_reference:
                 # TODO:  BuilderZarrTableDataset does not yet support region reference
                 data = BuilderZarrTableDataset(zarr_obj, self, retrieved_dtypes)
@@ -1476,27 +1992,32 @@ class ZarrIO(HDMFIO):
             # elif dtype == 'region':
             #     data = BuilderZarrRegionDataset(data, self)
 
-        kwargs['data'] = data
         if name is None:
             name = str(os.path.basename(zarr_obj.name))
-        ret = DatasetBuilder(name, **kwargs)  # create builder object for dataset
-        ret.location = ZarrIO.get_zarr_parent_path(zarr_obj)
+        # create builder object for dataset
+        shape = zarr_obj.shape  # get the shape only once, since zarr may refresh the metadata on each access
+        ret = DatasetBuilder(name,
+                             data=data,
+                             dtype=dtype,
+                             attributes=attributes,
+                             maxshape=shape,
+                             chunks=shape != zarr_obj.chunks,
+                             source=self.source)
+        ret.location = self.__get_zarr_parent_path(zarr_obj)
         self._written_builders.set_written(ret)  # record that the builder has been written
         self.__set_built(zarr_obj, ret)
         return ret
 
     def __read_attrs(self, zarr_obj):
         ret = dict()
-        for k in zarr_obj.attrs.keys():
+        # Get all attributes at once rather than looking up each key via zarr_obj.attrs
+        for k, v in zarr_obj.attrs.asdict().items():
             if k not in self.__reserve_attribute:
-                v = zarr_obj.attrs[k]
-                if isinstance(v, dict) and 'zarr_dtype' in v:
+                # attributes are decoded from JSON, so references are always plain dicts and the exact
+                # type check is intended. It is cheaper than isinstance for the common non-dict values.
+                if type(v) is dict and 'zarr_dtype' in v:  # noqa: E721
                     if v['zarr_dtype'] == 'object':
-                        target_name, target_zarr_obj = self.resolve_ref(v['value'])
-                        if isinstance(target_zarr_obj, zarr.hierarchy.Group):
-                            ret[k] = self.__read_group(target_zarr_obj, target_name)
-                        else:
-                            ret[k] = self.__read_dataset(target_zarr_obj, target_name)
+                        ret[k] = self.__read_ref_target(v['value'])
                     # TODO Need to implement region references for attributes
                     elif v['zarr_dtype'] == 'region':
                         raise NotImplementedError("Read of region references from attributes not implemented in ZarrIO")
@@ -1,5 +1,7 @@
 """Collection of utility I/O classes for the ZarrIO backend store."""
 import gc
+import os
+import mmap
 import traceback
 import multiprocessing
 import math
@@ -16,6 +18,7 @@ import numcodecs
 import zarr
 import numpy as np
 from zarr.hierarchy import Group
+from zarr.storage import DirectoryStore
 
 from hdmf.data_utils import DataIO, GenericDataChunkIterator, DataChunkIterator, AbstractDataChunkIterator
 from hdmf.query import HDMFDataset
@@ -273,6 +276,8 @@ class ZarrIODataChunkIteratorQueue(deque):
         global _worker_context
         global _operation_to_run
 
+        # Blosc's internal threads are not safe to use from multiple processes writing to the same store
+        numcodecs.blosc.use_threads = False
         if max_threads_per_process is None:
             _worker_context = process_initialization(*initialization_arguments)
         else:
@@ -332,6 +337,105 @@ class ZarrIODataChunkIteratorQueue(deque):
                 )
 
 
+class ObjectIdCache:
+    """
+    Helper class used by ZarrIO to cache values computed for objects, e.g., builders or stores, by the id of
+    the objects. Looking up an object by its id is fast and works for unhashable objects. However, the id of
+    an object may be reused once the object has been garbage collected, so the cache keeps a reference to
+    each object for as long as a value for it is cached.
+    """
+    def __init__(self):
+        self.__values = dict()
+
+    def __len__(self):
+        return len(self.__values)
+
+    def get(self, obj, key=None, default=None):
+        """
+        Get the value cached for the object and the optional key or the default if no value is cached
+        """
+        cached = self.__values.get((id(obj), key))
+        return default if cached is None else cached[1]
+
+    def set(self, obj, value, key=None):
+        """
+        Cache the value for the object and the optional key and return the value
+        """
+        self.__values[(id(obj), key)] = (obj, value)
+        return value
+
+    def pop(self, obj, key=None, default=None):
+        """
+        Remove the value cached for the object and the optional key and return it or the default if no value is cached
+        """
+        cached = self.__values.pop((id(obj), key), None)
+        return default if cached is None else cached[1]
+
+    def clear(self):
+        """
+        Remove all cached values and the references to their objects
+        """
+        self.__values.clear()
+
+
+class DirectIODirectoryStore(DirectoryStore):
+    """
+    DirectoryStore that writes files with direct I/O (``O_DIRECT``), bypassing the page cache.
+
+    This avoids the extra copy into the page cache (and resulting cache thrashing) when writing large,
+    uncompressed chunks to local disks. Direct I/O requires the size of the written data to be a multiple of
+    the block size of the file system. Values that do not meet this requirement (e.g., metadata or
+    compressed chunks), as well as platforms and file systems that do not support ``O_DIRECT``, are
+    written with regular buffered I/O instead.
+    """
+
+    BLOCK_SIZE = 4096
+    """
+    Alignment in bytes required for direct I/O writes
+    """
+
+    @classmethod
+    def _tofile(cls, a, fn):
+        """Write data to a file using direct I/O if possible"""
+        data = memoryview(a).cast('B')
+        nbytes = data.nbytes
+        if not hasattr(os, 'O_DIRECT') or nbytes == 0 or nbytes % cls.BLOCK_SIZE != 0:
+            return DirectoryStore._tofile(a, fn)
+        # Anonymous memory maps are page-aligned, as required for the buffer used for direct I/O
+        with mmap.mmap(-1, nbytes) as buffer:
+            buffer[:] = data
+            try:
+                fd = os.open(fn, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_DIRECT, 0o666)
+                try:
+                    with memoryview(buffer) as view:
+                        written = 0
+                        while written < nbytes:
+                            written += os.write(fd, view[written:])
+                finally:
+                    os.close(fd)
+            except OSError:  # e.g., EINVAL if the file system does not support direct I/O
+                DirectoryStore._tofile(a, fn)
+
+
+class MmapDirectoryStore(DirectoryStore):
+    """
+    DirectoryStore that reads files by memory-mapping them rather than copying their content.
+
+    Reading a chunk returns a read-only memoryview of the memory-mapped file, so that uncompressed chunks
+    can be decoded directly from the page cache without first being copied into a bytes object. Empty files,
+    which cannot be memory-mapped, are read as usual.
+    """
+
+    @staticmethod
+    def _fromfile(fn):
+        """Read data from a file by memory-mapping it"""
+        with open(fn, 'rb') as f:
+            try:
+                return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            except ValueError:  # empty files cannot be memory-mapped
+                return f.read()
+
+
 class ZarrSpecWriter(SpecWriter):
     """
     Class used to write format specs to Zarr
@@ -349,14 +453,16 @@ class ZarrSpecWriter(SpecWriter):
         return json.dumps(spec, separators=(',', ':'))
 
     def __write(self, d, name):
-        data = self.stringify(d)
-        dset = self.__group.require_dataset(name,
-                                            shape=(1, ),
-                                            dtype=object,
-                                            object_codec=numcodecs.JSON(),
-                                            compressor=None)
+        data = np.empty(shape=(1, ), dtype=object)
+        data[0] = self.stringify(d)
+        # Create the dataset together with its data to avoid probing the store for an existing dataset
+        # and writing the array metadata separately from the data
+        dset = self.__group.create_dataset(name,
+                                           data=data,
+                                           object_codec=numcodecs.JSON(),
+                                           compressor=None,
+                                           overwrite=True)
         dset.attrs['zarr_dtype'] = 'scalar'
-        dset[0] = data
         return dset
 
     def write_spec(self, spec, path):
@@ -416,7 +522,7 @@ class ZarrDataIO(DataIO):
              'default': None},
             {'name': 'compressor',
              'type': (numcodecs.abc.Codec, bool),
-             'doc': 'Zarr compressor filter to be used. Set to True to use Zarr default.'
+             'doc': 'Zarr compressor filter to be used. Set to True to use the ZarrIO default. '
                     'Set to False to disable compression)',
              'default': None},
             {'name': 'filters',
@@ -8,10 +8,12 @@ import os
 import numpy as np
 import shutil
 import warnings
+import threading
+from unittest.mock import patch
 
 # Try to import Zarr and disable tests if Zarr is not available
 import zarr
-from hdmf_zarr.backend import ZarrIO
+from hdmf_zarr.backend import ZarrIO, SPEC_LOC_ATTR
 from hdmf_zarr.utils import ZarrDataIO, ZarrReference
 from tests.unit.utils import (Baz, BazData, BazBucket, get_baz_buildmanager)
 
@@ -38,7 +40,8 @@ from tests.unit.utils import (Foo,
                               FooFile,
                               get_foo_buildmanager,
                               CacheSpecTestHelper,
-                              get_temp_filepath)
+                              get_temp_filepath,
+                              get_test_store_path)
 
 from abc import ABCMeta, abstractmethod
 
@@ -93,7 +96,7 @@ class ZarrStoreTestCase(TestCase):
     general purpose testing.
     """
     def setUp(self):
-        self.store = "tests/unit/test_io.zarr"
+        self.store = os.path.join("tests", "unit", get_test_store_path())
 
     def tearDown(self):
         if os.path.exists(self.store):
@@ -146,7 +149,7 @@ class BaseTestZarrWriter(BaseZarrWriterTestCase):
 
     def setUp(self):
         self.manager = get_foo_buildmanager()
-        self.store = "test_io.zarr"
+        self.store = get_test_store_path()
         self.store_path = self.store
 
     def createGroupBuilder(self):
@@ -243,6 +246,74 @@ class BaseTestZarrWriter(BaseZarrWriterTestCase):
         read_types = CacheSpecTestHelper.get_types(ns_catalog)
         self.assertSetEqual(source_types, read_types)
 
+    def test_load_namespaces_spec_not_consolidated(self):
+        """Test loading the spec of a file whose consolidated metadata was created before the spec was cached"""
+        foo1 = Foo('foo1', [0, 1, 2, 3, 4], "I am foo1", 17, 3.14)
+        foofile = FooFile(buckets=[FooBucket('test_bucket', [foo1])])
+        with ZarrIO(self.store, manager=self.manager, mode='w') as tempIO:
+            tempIO.write(foofile, cache_spec=False)
+        # Cache the spec without updating the consolidated metadata, as earlier versions of hdmf-zarr did
+        with ZarrIO(self.store, manager=self.manager, mode='r+') as tempIO:
+            tempIO._ZarrIO__cache_spec()
+        self.assertNotIn(SPEC_LOC_ATTR, zarr.open_consolidated(self.store, mode='r').attrs)
+
+        ns_catalog = NamespaceCatalog()
+        ZarrIO.load_namespaces(ns_catalog, self.store)
+        self.assertEqual(ns_catalog.namespaces, ('test_core',))
+
+    def test_cache_spec_consolidated_if_nothing_else_written(self):
+        """Test that caching the spec without writing new containers updates the consolidated metadata"""
+        foo1 = Foo('foo1', [0, 1, 2, 3, 4], "I am foo1", 17, 3.14)
+        foofile = FooFile(buckets=[FooBucket('test_bucket', [foo1])])
+        with ZarrIO(self.store, manager=self.manager, mode='w') as tempIO:
+            tempIO.write(foofile, cache_spec=False)
+            tempIO.write(foofile, cache_spec=True)
+        self.assertIn(SPEC_LOC_ATTR, zarr.open_consolidated(self.store, mode='r').attrs)
+
+    def test_write_groups_in_parallel(self):
+        """Test that writing sibling groups with a thread pool (i.e., number_of_jobs > 1) roundtrips"""
+        foo1 = Foo('foo1', [0, 1, 2, 3, 4], "I am foo1", 17, 3.14)
+        foo2 = Foo('foo2', [5, 6, 7, 8, 9], "I am foo2", 34, 6.28)
+        foo3 = Foo('foo3', [10, 11, 12], "I am foo3", 51, 9.42)
+        foofile = FooFile(buckets=[FooBucket('bucket1', [foo1, foo2]), FooBucket('bucket2', [foo3])])
+        with ZarrIO(self.store, manager=self.manager, mode='w') as write_io:
+            write_io.write(foofile, number_of_jobs=2)
+        with ZarrIO(self.store, manager=get_foo_buildmanager(), mode='r') as read_io:
+            read_foofile = read_io.read()
+            self.assertContainerEqual(foofile, read_foofile, ignore_hdmf_attrs=True)
+
+    def test_write_references_in_parallel_on_calling_thread(self):
+        """Test that with a thread pool, the references of datasets are created on the calling thread only"""
+        target = DatasetBuilder('target', np.arange(5))
+        subgroup = GroupBuilder('subgroup',
+                                datasets={'target': target,
+                                          'data': DatasetBuilder('data', np.arange(10)),
+                                          'ref_data': DatasetBuilder('ref_data', [ReferenceBuilder(target)],
+                                                                     dtype='object'),
+                                          'ref_attr_data': DatasetBuilder('ref_attr_data', np.arange(3),
+                                                                          attributes={'ref': target})})
+        builder = GroupBuilder('root', groups={'subgroup': subgroup})
+        get_ref = ZarrIO._ZarrIO__get_ref
+        ref_threads = []
+
+        def tracking_get_ref(io, *args, **kwargs):
+            ref_threads.append(threading.current_thread())
+            return get_ref(io, *args, **kwargs)
+
+        with ZarrIO(self.store, mode='w') as writer:
+            with patch.object(ZarrIO, '_ZarrIO__get_ref', tracking_get_ref):
+                writer._ZarrIO__start_io_pool(2)
+                try:
+                    writer.write_builder(builder)
+                finally:
+                    writer._ZarrIO__stop_io_pool()
+        self.assertEqual(len(ref_threads), 2)
+        self.assertTrue(all(thread is threading.main_thread() for thread in ref_threads))
+        with ZarrIO(self.store, mode='r') as reader:
+            read_builder = reader.read_builder()
+            self.assertIs(read_builder['subgroup/ref_data'].data[0], read_builder['subgroup/target'])
+            self.assertIs(read_builder['subgroup/ref_attr_data'].attributes['ref'], read_builder['subgroup/target'])
+
     def test_write_int(self, test_data=None):
         data = np.arange(100, 200, 10).reshape(2, 5) if test_data is None else test_data
         self.__dataset_builder = DatasetBuilder('my_data', data, attributes={'attr2': 17})
@@ -299,6 +370,12 @@ class BaseTestZarrWriter(BaseZarrWriterTestCase):
         writer.write_builder(self.builder)
         writer.close()
 
+    def test_write_links_order(self):
+        self.test_write_links()
+        zarr_file = zarr.open(self.store, mode='r')
+        link_names = [link['name'] for link in zarr_file['test_bucket'].attrs['zarr_link']]
+        self.assertListEqual(link_names, ['my_link', 'my_dataset'])
+
     def test_write_link_array(self):
         data = np.arange(100, 200, 10).reshape(2, 5)
         self.__dataset_builder = DatasetBuilder('my_data', data, attributes={'attr2': 17})
@@ -485,21 +562,33 @@ class BaseTestZarrWriteUnit(BaseZarrWriterTestCase):
     """
 
     def setUp(self):
-        self.store = "test_io.zarr"
+        self.store = get_test_store_path()
         self.store_path = self.store
 
     #############################################
     #  ZarrDataIO general
     #############################################
     def test_set_object_codec(self):
-        # Test that the default codec is the Pickle store
+        # Test that the default codec is the MsgPack codec
         tempIO = ZarrIO(self.store, mode='w')
-        self.assertEqual(tempIO.object_codec_class.__qualname__, 'Pickle')
+        self.assertEqual(tempIO.object_codec_class.__qualname__, 'MsgPack')
         del tempIO  # also calls tempIO.close()
         tempIO = ZarrIO(self.store, mode='w', object_codec_class=JSON)
         self.assertEqual(tempIO.object_codec_class.__qualname__, 'JSON')
         tempIO.close()
 
+    def test_write_object_dataset_with_numpy_scalars(self):
+        """Test that object datasets with numpy scalars, which MsgPack cannot encode, are written as Python scalars"""
+        tempIO = ZarrIO(self.store, mode='w')
+        tempIO.open()
+        data = [[np.int64(1), 'a'], [np.bool_(True), b'b'], [np.float32(2.5), [np.int8(3), np.str_('c')]]]
+        tempIO.write_dataset(tempIO.file, DatasetBuilder('test_dataset', data, attributes={}, dtype=np.dtype('O')))
+        dset = tempIO.file['test_dataset']
+        self.assertListEqual(dset[:].tolist(), [[1, 'a'], [True, 'b'], [2.5, [3, 'c']]])
+        self.assertIs(type(dset[0][0]), int)
+        self.assertIs(type(dset[1][0]), bool)
+        tempIO.close()
+
     def test_synchronizer_constructor_arg_bool(self):
         """Test that setting the synchronizer argument to True/False works in ZarrIO"""
         tempIO = ZarrIO(self.store, mode='w', synchronizer=False)
@@ -509,6 +598,19 @@ class BaseTestZarrWriteUnit(BaseZarrWriterTestCase):
         self.assertTrue(isinstance(tempIO.synchronizer, zarr.ProcessSynchronizer))
         tempIO.close()
 
+    def test_synchronizer_used_for_datasets(self):
+        """Test that the synchronizer is used for datasets independent of whether their chunks are fully written"""
+        tempIO = ZarrIO(self.store, mode='w', synchronizer=zarr.ThreadSynchronizer())
+        aligned = tempIO.write_dataset(tempIO.file, DatasetBuilder('aligned', ZarrDataIO(np.arange(10),
+                                                                                         chunks=(5, ))))
+        self.assertIs(aligned.synchronizer, tempIO.synchronizer)
+        unaligned = tempIO.write_dataset(tempIO.file, DatasetBuilder('unaligned', ZarrDataIO(np.arange(10),
+                                                                                             chunks=(4, ))))
+        self.assertIs(unaligned.synchronizer, tempIO.synchronizer)
+        np.testing.assert_array_equal(tempIO.file['aligned'][:], np.arange(10))
+        np.testing.assert_array_equal(tempIO.file['unaligned'][:], np.arange(10))
+        tempIO.close()
+
     def test_zarrdataio_enable_default_compressor(self):
         """Default compression simply means not specifying any compressor and using Zarr defaults"""
         dataio = ZarrDataIO(np.arange(30).reshape(5, 2, 3), compressor=True)
@@ -700,6 +802,20 @@ class BaseTestZarrWriteUnit(BaseZarrWriterTestCase):
         self.assertEqual(dset[()], a)
         tempIO.close()
 
+    def test_write_dataset_scalar_name_clash(self):
+        """Test that writing a scalar does not replace an existing group or array with the same name"""
+        tempIO = ZarrIO(self.store, mode='w')
+        tempIO.open()
+        tempIO.file.create_group('test_group')
+        tempIO.file.create_dataset('test_dataset', data=np.arange(5))
+        with self.assertRaises(zarr.errors.ContainsGroupError):
+            tempIO.write_dataset(tempIO.file, DatasetBuilder('test_group', 10, attributes={}))
+        with self.assertRaises(zarr.errors.ContainsArrayError):
+            tempIO.write_dataset(tempIO.file, DatasetBuilder('test_dataset', 10, attributes={}))
+        self.assertIsInstance(tempIO.file['test_group'], zarr.Group)
+        np.testing.assert_array_equal(tempIO.file['test_dataset'][:], np.arange(5))
+        tempIO.close()
+
     def test_write_dataset_string(self):
         a = 'test string'
         tempIO = ZarrIO(self.store, mode='w')
@@ -756,6 +872,18 @@ class BaseTestZarrWriteUnit(BaseZarrWriterTestCase):
         self.assertTrue(dset.compressor == compressor)
         tempIO.close()
 
+    @unittest.skipIf(DISABLE_ZARR_COMPRESSION_TESTS, 'Skip test due to numcodec compressor not available')
+    def test_write_dataset_list_default_compressor(self):
+        """Test that datasets without a compressor are written with the ZarrIO default compressor"""
+        a = np.arange(30).reshape(5, 2, 3)
+        tempIO = ZarrIO(self.store, mode='w')
+        tempIO.open()
+        tempIO.write_dataset(tempIO.file, DatasetBuilder('test_dataset', a, attributes={}))
+        dset = tempIO.file['test_dataset']
+        self.assertTrue(np.all(dset[:] == a))
+        self.assertEqual(dset.compressor, Blosc(cname='zstd', clevel=3, shuffle=Blosc.BITSHUFFLE))
+        tempIO.close()
+
     @unittest.skipIf(DISABLE_ZARR_COMPRESSION_TESTS, 'Skip test due to numcodec compressor not available')
     def test_write_dataset_list_compress_and_filter(self):
         compressor = Blosc(cname='zstd', clevel=3, shuffle=Blosc.BITSHUFFLE)
@@ -821,6 +949,20 @@ class BaseTestZarrWriteUnit(BaseZarrWriterTestCase):
             self.assertEqual(str(dset[i]), str(data[i]))
         tempIO.close()
 
+    def test_write_structured_array_table_with_strings(self):
+        """Test that the records of compound datasets with string fields keep their field names"""
+        cmpd_dt = np.dtype([('a', np.int32), ('b', 'U10')])
+        data = np.array([(1, 'one'), (2, 'two')], dtype=cmpd_dt)
+        dt = [{'name': 'a', 'dtype': 'int32', 'doc': 'a column'},
+              {'name': 'b', 'dtype': 'text', 'doc': 'b column'}]
+        tempIO = ZarrIO(self.store, mode='w')
+        tempIO.open()
+        tempIO.write_dataset(tempIO.file, DatasetBuilder('test_dataset', data, attributes={}, dtype=dt))
+        dset = tempIO.file['test_dataset']
+        self.assertListEqual([row['a'] for row in dset[:]], [1, 2])
+        self.assertListEqual([row['b'] for row in dset[:]], ['one', 'two'])
+        tempIO.close()
+
     #############################################
     #  write_dataset tests: data chunk iterator
     #############################################
@@ -861,6 +1003,17 @@ class BaseTestZarrWriteUnit(BaseZarrWriterTestCase):
         self.assertListEqual(dset[:].tolist(), list(range(10)))
         tempIO.close()
 
+    def test_write_dataset_data_chunk_iterator_flush(self):
+        dci = DataChunkIterator(data=np.arange(10), buffer_size=2)
+        tempIO = ZarrIO(self.store, mode='w')
+        tempIO.open()
+        tempIO.write_dataset(tempIO.file, DatasetBuilder('test_dataset', dci, attributes={}), exhaust_dci=False)
+        dset = tempIO.file['test_dataset']
+        self.assertEqual(dset.nchunks_initialized, 0)  # the iterator is only queued
+        tempIO.flush()
+        self.assertListEqual(dset[:].tolist(), list(range(10)))
+        tempIO.close()
+
     def test_write_dataset_data_chunk_iterator_with_compression(self):
         dci = DataChunkIterator(data=np.arange(10), buffer_size=2)
         compressor = Blosc(cname='zstd', clevel=3, shuffle=Blosc.BITSHUFFLE)
@@ -53,7 +53,7 @@ from hdmf.common import CSRMatrix
 
 from tests.unit.utils import (Foo, FooBucket, FooFile, get_foo_buildmanager,
                               Baz, BazData, BazBucket, get_baz_buildmanager,
-                              BazCpdData, get_temp_filepath)
+                              BazCpdData, get_temp_filepath, get_test_store_path)
 
 from zarr.storage import (DirectoryStore,
                           TempStore,
@@ -222,9 +222,9 @@ class MixinTestHDF5ToZarr():
     """
     WRITE_PATHS = [None, ]
     EXPORT_PATHS = [None,
-                    DirectoryStore('test_export_DirectoryStore.zarr'),
+                    DirectoryStore(get_test_store_path('test_export_DirectoryStore')),
                     TempStore(),
-                    NestedDirectoryStore('test_export_NestedDirectoryStore.zarr')]
+                    NestedDirectoryStore(get_test_store_path('test_export_NestedDirectoryStore'))]
     TARGET_FORMAT = "ZARR"
 
     def get_manager(self):
@@ -252,9 +252,9 @@ class MixinTestZarrToHDF5():
     (e.g., by another mixin or the test class itself)
     """
     WRITE_PATHS = [None,
-                   DirectoryStore('test_export_DirectoryStore.zarr'),
+                   DirectoryStore(get_test_store_path('test_export_DirectoryStore')),
                    TempStore(),
-                   NestedDirectoryStore('test_export_NestedDirectoryStore.zarr')]
+                   NestedDirectoryStore(get_test_store_path('test_export_NestedDirectoryStore'))]
     EXPORT_PATHS = [None, ]
     TARGET_FORMAT = "H5"
 
@@ -283,13 +283,13 @@ class MixinTestZarrToZarr():
     (e.g., by another mixin or the test class itself)
     """
     WRITE_PATHS = [None,
-                   DirectoryStore('test_export_DirectoryStore_Source.zarr'),
+                   DirectoryStore(get_test_store_path('test_export_DirectoryStore_Source')),
                    TempStore(dir=os.path.dirname(__file__)),  # set dir to avoid switching drives on Windows
-                   NestedDirectoryStore('test_export_NestedDirectoryStore_Source.zarr')]
+                   NestedDirectoryStore(get_test_store_path('test_export_NestedDirectoryStore_Source'))]
     EXPORT_PATHS = [None,
-                    DirectoryStore('test_export_DirectoryStore_Export.zarr'),
+                    DirectoryStore(get_test_store_path('test_export_DirectoryStore_Export')),
                     TempStore(dir=os.path.dirname(__file__)),   # set dir to avoid switching drives on Windows
-                    NestedDirectoryStore('test_export_NestedDirectoryStore_Export.zarr')]
+                    NestedDirectoryStore(get_test_store_path('test_export_NestedDirectoryStore_Export'))]
     TARGET_FORMAT = "ZARR"
 
     def get_manager(self):
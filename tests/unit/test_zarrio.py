@@ -13,12 +13,22 @@ from tests.unit.base_tests_zarrio import (BaseTestZarrWriter,
                                           ZarrStoreTestCase,
                                           BaseTestZarrWriteUnit,
                                           BaseTestExportZarrToZarr)
+from tests.unit.utils import get_test_store_path
 from zarr.storage import (DirectoryStore,
                           TempStore,
                           NestedDirectoryStore)
 import zarr
 from hdmf_zarr.backend import ZarrIO
+from hdmf_zarr.utils import ZarrDataIO, DirectIODirectoryStore, MmapDirectoryStore, ObjectIdCache
+from hdmf.build import GroupBuilder, DatasetBuilder, LinkBuilder, ReferenceBuilder
+from hdmf.data_utils import DataChunkIterator
+from hdmf.query import HDMFDataset
 import os
+import weakref
+import h5py
+import numpy as np
+from unittest.mock import patch
+from hdmf.testing import TestCase
 
 
 CUR_DIR = os.path.dirname(os.path.realpath(__file__))
@@ -70,7 +80,7 @@ class TestZarrWriterDirectoryStore(BaseTestZarrWriter):
 class TestZarrWriteUnitDirectoryStore(BaseTestZarrWriteUnit):
     """Unit test for individual write functions using a custom DirectoryStore"""
     def setUp(self):
-        self.store_path = "test_io.zarr"
+        self.store_path = get_test_store_path()
         self.store = DirectoryStore(self.store_path)
 
 
@@ -120,7 +130,7 @@ class TestZarrWriterNestedDirectoryStore(BaseTestZarrWriter):
 class TestZarrWriteUnitNestedDirectoryStore(BaseTestZarrWriteUnit):
     """Unit test for individual write functions using a custom NestedDirectoryStore"""
     def setUp(self):
-        self.store_path = "test_io.zarr"
+        self.store_path = get_test_store_path()
         self.store = NestedDirectoryStore(self.store_path)
 
 
@@ -142,7 +152,7 @@ class TestConsolidateMetadata(ZarrStoreTestCase):
         self.create_zarr(consolidate_metadata=False)
         store = DirectoryStore(self.store)
         path = ZarrIO._ZarrIO__get_store_path(store)
-        expected_path = os.path.normpath(os.path.join(CUR_DIR, 'test_io.zarr'))
+        expected_path = os.path.normpath(os.path.join(CUR_DIR, os.path.basename(self.store)))
         self.assertEqual(path, expected_path)
 
     def test_get_store_path_deep(self):
@@ -150,7 +160,7 @@ class TestConsolidateMetadata(ZarrStoreTestCase):
         zarr_obj = zarr.open_consolidated(self.store, mode='r')
         store = zarr_obj.store
         path = ZarrIO._ZarrIO__get_store_path(store)
-        expected_path = os.path.normpath(os.path.join(CUR_DIR, 'test_io.zarr'))
+        expected_path = os.path.normpath(os.path.join(CUR_DIR, os.path.basename(self.store)))
         self.assertEqual(path, expected_path)
 
     def test_force_open_without_consolidated(self):
@@ -182,3 +192,352 @@ class TestConsolidateMetadata(ZarrStoreTestCase):
             except ValueError as e:
                 self.fail("ZarrIO.__open_file_consolidated raised an unexpected ValueError: {}".format(e))
 
+    def test_skip_consolidate_metadata_if_nothing_written(self):
+        """Test that writing the same builders again does not consolidate the metadata a second time"""
+        builder = self.createReferenceBuilder()
+        writer = ZarrIO(self.store, mode='a')
+        writer.write_builder(builder)
+        self.assertTrue(os.path.exists(os.path.join(self.store, '.zmetadata')))
+        with patch('hdmf_zarr.backend.zarr.consolidate_metadata') as mock_consolidate:
+            writer.write_builder(builder)
+            mock_consolidate.assert_not_called()
+        writer.close()
+
+    def test_consolidate_metadata_if_only_attributes_written(self):
+        """Test that appending only attributes to already written builders updates the consolidated metadata"""
+        builder = self.createReferenceBuilder()
+        with ZarrIO(self.store, mode='a') as writer:
+            writer.write_builder(builder)
+            builder.set_attribute('new_attr', 'new_value')
+            writer.write_builder(builder)
+        self.assertEqual(zarr.open_consolidated(self.store, mode='r').attrs['new_attr'], 'new_value')
+
+    def test_open_without_consolidated_metadata(self):
+        """Test that files without consolidated metadata are opened with the regular store"""
+        with ZarrIO(self.store, mode='w') as writer:
+            writer.write_builder(self.createReferenceBuilder(), consolidate_metadata=False)
+        with ZarrIO(self.store, mode='r') as reader:
+            self.assertNotIsInstance(reader.file.store, zarr.storage.ConsolidatedMetadataStore)
+            self.assertListEqual(sorted(reader.file.keys()), ['dataset_1', 'dataset_2', 'ref_dataset'])
+
+    def test_is_remote_consolidated_local(self):
+        """Test that a local file opened with consolidated metadata is not considered remote"""
+        self.create_zarr()
+        with ZarrIO(self.store, mode='r') as reader:
+            self.assertIsInstance(reader.file.store, zarr.storage.ConsolidatedMetadataStore)
+            self.assertFalse(reader.is_remote())
+
+    def test_open_consolidated_reads_metadata_once(self):
+        """Test that opening a file with consolidated metadata accesses the .zmetadata key only once"""
+        self.create_zarr()
+        accessed_keys = []
+        getitem = DirectoryStore.__getitem__
+        contains = DirectoryStore.__contains__
+
+        def tracking_getitem(store, key):
+            accessed_keys.append(key)
+            return getitem(store, key)
+
+        def tracking_contains(store, key):
+            accessed_keys.append(key)
+            return contains(store, key)
+
+        with patch.object(DirectoryStore, '__getitem__', tracking_getitem):
+            with patch.object(DirectoryStore, '__contains__', tracking_contains):
+                with ZarrIO(self.store, mode='r') as reader:
+                    self.assertIsInstance(reader.file.store, zarr.storage.ConsolidatedMetadataStore)
+                    self.assertIsInstance(reader.file.store.store, DirectoryStore)
+        self.assertEqual(accessed_keys.count('.zmetadata'), 1)
+
+
+#########################################
+#  Reference resolution tests
+#########################################
+class TestResolveRef(ZarrStoreTestCase):
+    """
+    Tests for resolving references to Zarr objects with ZarrIO.resolve_ref
+    """
+    def test_resolve_ref_opens_target_once(self):
+        """Test that resolving several references to the same file opens the target file only once"""
+        self.create_zarr()
+        with ZarrIO(self.store, mode='r') as reader:
+            refs = reader.file['ref_dataset'][:]
+            with patch.object(ZarrIO, '_ZarrIO__open_file_consolidated',
+                              wraps=ZarrIO._ZarrIO__open_file_consolidated) as mock_open:
+                targets = [reader.resolve_ref(ref)[1] for ref in refs]
+            mock_open.assert_called_once()
+        self.assertListEqual([target.name for target in targets], ['/dataset_1', '/dataset_2'])
+
+    def test_resolve_ref_cached(self):
+        """Test that resolving the same reference twice returns the cached target"""
+        self.create_zarr()
+        with ZarrIO(self.store, mode='r') as reader:
+            ref = reader.file['ref_dataset'][0]
+            target = reader.resolve_ref(ref)
+            self.assertIs(reader.resolve_ref(dict(ref))[1], target[1])
+
+    def test_resolve_ref_returns_name_and_target(self):
+        """Test that resolve_ref returns only the name and target object also when the target is cached"""
+        self.create_zarr()
+        with ZarrIO(self.store, mode='r') as reader:
+            ref = reader.file['ref_dataset'][0]
+            for _ in range(2):
+                target_name, target_zarr_obj = reader.resolve_ref(ref)
+                self.assertEqual(target_name, 'dataset_1')
+                self.assertIsInstance(target_zarr_obj, zarr.Array)
+
+
+#########################################
+#  is_zarr_file tests
+#########################################
+class TestIsZarrFile(ZarrStoreTestCase):
+    """
+    Tests for detecting Zarr files with ZarrIO.is_zarr_file
+    """
+    def test_is_zarr_file(self):
+        """Test that is_zarr_file detects Zarr files and rejects missing paths and regular files"""
+        self.create_zarr()
+        self.assertTrue(ZarrIO.is_zarr_file(self.store))
+        self.assertFalse(ZarrIO.is_zarr_file(os.path.join(self.store, 'dataset_1')))
+        self.assertFalse(ZarrIO.is_zarr_file(os.path.join(self.store, '.zgroup')))
+        self.assertFalse(ZarrIO.is_zarr_file(os.path.join(CUR_DIR, 'does_not_exist.zarr')))
+
+
+#########################################
+#  Reference write tests
+#########################################
+class TestWriteReferences(ZarrStoreTestCase):
+    """
+    Tests for writing references with ZarrIO
+    """
+    def test_dataset_reference_object_id(self):
+        """Test that references to datasets record the object_id of the dataset and of the root"""
+        data = DatasetBuilder('data', np.arange(5), attributes={'object_id': 'dataset-id'})
+        ref = DatasetBuilder('ref', ReferenceBuilder(data), dtype='object')
+        builder = GroupBuilder('root', datasets={'data': data, 'ref': ref}, attributes={'object_id': 'root-id'})
+        with ZarrIO(self.store, mode='w') as writer:
+            writer.write_builder(builder)
+        with ZarrIO(self.store, mode='r') as reader:
+            zarr_ref = reader.file['ref'][0]
+        self.assertEqual(zarr_ref['object_id'], 'dataset-id')
+        self.assertEqual(zarr_ref['source_object_id'], 'root-id')
+
+    def test_references_to_same_builder_created_once(self):
+        """Test that references to the same builder are only created once per write"""
+        data = DatasetBuilder('data', np.arange(5))
+        refs = DatasetBuilder('refs', [ReferenceBuilder(data)] * 3, dtype='object')
+        links = GroupBuilder('links', links={'link': LinkBuilder(data, 'link')})
+        builder = GroupBuilder('root', groups={'links': links}, datasets={'data': data, 'refs': refs})
+        with ZarrIO(self.store, mode='w') as writer:
+            with patch.object(writer, '_ZarrIO__get_path', wraps=writer._ZarrIO__get_path) as mock_get_path:
+                writer.write_builder(builder)
+            mock_get_path.assert_called_once_with(data)
+        with ZarrIO(self.store, mode='r') as reader:
+            zarr_refs = reader.file['refs'][:]
+            link = reader.file['links'].attrs['zarr_link']
+        self.assertTrue(all(ref['path'] == '/data' for ref in zarr_refs))
+        self.assertEqual(link[0]['path'], '/data')
+
+
+#########################################
+#  HDMFDataset write tests
+#########################################
+class TestWriteHDMFDataset(ZarrStoreTestCase):
+    """
+    Tests for writing datasets whose data is an HDMFDataset
+    """
+    def test_write_large_hdmfdataset_in_blocks(self):
+        """Test that numeric HDMFDatasets larger than HDMFDATASET_STREAM_SIZE are copied in blocks"""
+        data = np.arange(100, dtype='i8').reshape(50, 2)
+        with patch('hdmf_zarr.backend.HDMFDATASET_STREAM_SIZE', 80):  # blocks of 5 rows
+            with patch('hdmf_zarr.backend.DataChunkIterator', wraps=DataChunkIterator) as mock_dci:
+                with ZarrIO(self.store, mode='w') as writer:
+                    writer.write_dataset(writer.file, DatasetBuilder('data', HDMFDataset(data)))
+        mock_dci.assert_called_once_with(data=data, buffer_size=5)
+        with ZarrIO(self.store, mode='r') as reader:
+            np.testing.assert_array_equal(reader.file['data'][:], data)
+
+    def test_write_large_h5py_dataset_in_blocks(self):
+        """Test that numeric h5py.Datasets larger than HDMFDATASET_STREAM_SIZE are copied in blocks"""
+        data = np.arange(100, dtype='i8').reshape(50, 2)
+        hdf_filename = get_test_store_path('test_h5py_source', '.h5')
+        self.addCleanup(os.remove, hdf_filename)
+        with h5py.File(hdf_filename, mode='w') as h5file:
+            h5dset = h5file.create_dataset('data', data=data, chunks=(10, 2))
+            with patch('hdmf_zarr.backend.HDMFDATASET_STREAM_SIZE', 80):  # blocks of 5 rows
+                with patch('hdmf_zarr.backend.DataChunkIterator', wraps=DataChunkIterator) as mock_dci:
+                    with ZarrIO(self.store, mode='w') as writer:
+                        writer.write_dataset(writer.file, DatasetBuilder('data', h5dset))
+            mock_dci.assert_called_once_with(data=h5dset, buffer_size=5)
+        with ZarrIO(self.store, mode='r') as reader:
+            self.assertTupleEqual(reader.file['data'].chunks, (10, 2))
+            np.testing.assert_array_equal(reader.file['data'][:], data)
+
+
+#########################################
+#  Remote read prefetch tests
+#########################################
+class TestRemoteReadPrefetch(ZarrStoreTestCase):
+    """
+    Tests for prefetching the datasets of remote files in parallel on read
+    """
+    def test_read_remote_prefetches_datasets(self):
+        """Test that the datasets of remote files are prefetched in parallel and read the same as local files"""
+        self.create_zarr()
+        with ZarrIO(self.store, mode='r') as reader:
+            expected = reader.read_builder()
+            expected_data = {name: dset.data[:]
+                             for name, dset in expected.datasets.items() if dset.dtype != 'object'}
+        with patch.object(ZarrIO, 'is_remote', return_value=True):
+            with ZarrIO(self.store, mode='r') as reader:
+                with patch.object(ZarrIO, '_ZarrIO__prefetch_dataset',
+                                  wraps=ZarrIO._ZarrIO__prefetch_dataset) as mock_prefetch:
+                    builder = reader.read_builder()
+                self.assertEqual(mock_prefetch.call_count, len(expected.datasets))
+                self.assertSetEqual(set(builder.datasets), set(expected.datasets))
+                for name, data in expected_data.items():
+                    np.testing.assert_array_equal(builder.datasets[name].data[:], data)
+
+
+#########################################
+#  zarr_dtype serialization tests
+#########################################
+class TestSerialDtype(TestCase):
+    """
+    Tests for serializing dtypes for the zarr_dtype attribute with ZarrIO.__serial_dtype__
+    """
+    def test_serial_dtype_equal_dtypes(self):
+        """Test that dtypes that compare equal but have different types serialize independent of call order"""
+        longlong, long = np.dtype('q'), np.dtype('l')
+        expected = [longlong.type.__name__, long.type.__name__]
+        self.assertListEqual([ZarrIO.__serial_dtype__(longlong), ZarrIO.__serial_dtype__(long)], expected)
+        self.assertListEqual([ZarrIO.__serial_dtype__(long), ZarrIO.__serial_dtype__(longlong)], expected[::-1])
+        compound = [np.dtype([('a', dtype)]) for dtype in (longlong, long)]
+        self.assertListEqual([ZarrIO.__serial_dtype__(dtype)[0]['dtype'] for dtype in compound[::-1]],
+                             expected[::-1])
+        self.assertListEqual([ZarrIO.__serial_dtype__(dtype)[0]['dtype'] for dtype in compound], expected)
+
+
+#########################################
+#  Dimension separator tests
+#########################################
+class TestDimensionSeparator(ZarrStoreTestCase):
+    """
+    Tests for the dimension separator used for chunks of new files
+    """
+    def test_new_file_uses_nested_chunks(self):
+        """Test that chunks of arrays in a new file are stored in nested directories"""
+        self.create_zarr()
+        with ZarrIO(self.store, mode='r') as reader:
+            self.assertEqual(reader.file['dataset_1']._dimension_separator, '/')
+        self.assertTrue(os.path.isdir(os.path.join(self.store, 'dataset_1', '0')))
+
+    def test_existing_file_keeps_separator(self):
+        """Test that appending to an existing flat file does not change the layout of existing arrays"""
+        zarr.open(self.store, mode='w').create_dataset('flat', data=np.arange(10), chunks=(5,))
+        with ZarrIO(self.store, mode='a') as writer:
+            self.assertEqual(writer.file['flat']._dimension_separator, '.')
+            np.testing.assert_array_equal(writer.file['flat'][:], np.arange(10))
+
+
+#########################################
+#  Direct I/O tests
+#########################################
+class TestDirectIO(ZarrStoreTestCase):
+    """
+    Tests for writing with direct I/O via DirectIODirectoryStore
+    """
+    def test_write_direct_io(self):
+        """Test that data written with direct_io=True roundtrips"""
+        data = np.arange(4096, dtype='f4')  # uncompressed chunks with a size that is a multiple of the block size
+        builder = GroupBuilder('root', datasets={'data': DatasetBuilder('data', ZarrDataIO(data,
+                                                                                           chunks=(1024, ),
+                                                                                           compressor=False))})
+        with ZarrIO(self.store, mode='w', direct_io=True) as writer:
+            self.assertIsInstance(writer.file.store, DirectIODirectoryStore)
+            writer.write_builder(builder)
+        with ZarrIO(self.store, mode='r') as reader:
+            np.testing.assert_array_equal(reader.file['data'][:], data)
+
+
+#########################################
+#  Memory-mapped read tests
+#########################################
+class TestMmapRead(ZarrStoreTestCase):
+    """
+    Tests for reading with memory-mapped files via MmapDirectoryStore
+    """
+    def test_read_mmap(self):
+        """Test that data read with use_mmap=True matches the written data"""
+        data = np.arange(100, dtype='f8').reshape(10, 10)
+        builder = GroupBuilder('root',
+                               datasets={'data': DatasetBuilder('data', ZarrDataIO(data, chunks=(5, 5),
+                                                                                   compressor=False)),
+                                         'scalar': DatasetBuilder('scalar', 'text')},
+                               attributes={'attr': 'value'})
+        with ZarrIO(self.store, mode='w') as writer:
+            writer.write_builder(builder)
+        with ZarrIO(self.store, mode='r', use_mmap=True) as reader:
+            self.assertIsInstance(reader.file.store.store, MmapDirectoryStore)
+            read_builder = reader.read_builder()
+            np.testing.assert_array_equal(read_builder['data'].data[:], data)
+            self.assertEqual(read_builder['scalar'].data, 'text')
+            self.assertEqual(read_builder.attributes['attr'], 'value')
+
+
+#########################################
+#  can_read tests
+#########################################
+class TestCanRead(TestCase):
+    """
+    Tests for checking whether ZarrIO can read a path with ZarrIO.can_read
+    """
+    def setUp(self):
+        self.store = get_test_store_path("test_can_read", ext=".zip")
+
+    def tearDown(self):
+        if os.path.exists(self.store):
+            os.remove(self.store)
+
+    def test_can_read_zip_closes_store(self):
+        """Test that the ZipStore created to probe a path to a .zip file is closed again"""
+        zip_store = zarr.storage.ZipStore(self.store, mode='w')
+        zarr.group(store=zip_store)
+        zip_store.close()
+        close = zarr.storage.ZipStore.close
+        with patch.object(zarr.storage.ZipStore, 'close', autospec=True, side_effect=close) as mock_close:
+            self.assertTrue(ZarrIO.can_read(self.store))
+            mock_close.assert_called_once()
+
+
+#########################################
+#  Object id cache tests
+#########################################
+class TestObjectIdCache(ZarrStoreTestCase):
+    """
+    Tests for the ObjectIdCache used by ZarrIO to cache values by the id of objects
+    """
+    def test_cache_keeps_objects_alive(self):
+        """Test that cached objects are not garbage collected, so that their ids cannot be reused"""
+        cache = ObjectIdCache()
+        obj = GroupBuilder('test_group')
+        obj_ref = weakref.ref(obj)
+        self.assertEqual(cache.set(obj, 'value'), 'value')
+        self.assertEqual(cache.set(obj, 'other value', key=True), 'other value')
+        del obj
+        self.assertIsNotNone(obj_ref())
+        self.assertEqual(cache.get(obj_ref()), 'value')
+        self.assertEqual(cache.get(obj_ref(), key=True), 'other value')
+        self.assertEqual(cache.pop(obj_ref(), key=True), 'other value')
+        self.assertIsNone(cache.get(obj_ref(), key=True))
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertIsNone(obj_ref())
+
+    def test_write_builder_clears_write_caches(self):
+        """Test that write_builder does not keep the builders it cached while writing"""
+        with ZarrIO(self.store, mode='w') as writer:
+            writer.write_builder(self.createReferenceBuilder())
+            self.assertEqual(len(writer._ZarrIO__path_cache), 0)
+            self.assertEqual(len(writer._ZarrIO__root_cache), 0)
+            self.assertEqual(len(writer._ZarrIO__ref_cache), 0)
@@ -34,6 +34,14 @@ def get_temp_filepath():
     return temp_file.name
 
 
+def get_test_store_path(name='test_io', ext='.zarr'):
+    """
+    Get the path of a Zarr store for testing that is unique for the current process, such that tests
+    run in parallel processes, e.g., with ``pytest -n auto`` using ``pytest-xdist``, do not write to the same files.
+    """
+    return "%s_%d%s" % (name, os.getpid(), ext)
+
+
 def check_s3fs_ffspec_installed():
     """Check if s3fs and ffspec are installed required for streaming access from S3"""
     try: